@@ -1,19 +1,14 @@
 """
 Script para analizar el archivo de ejemplo con el código actual.
 """
-import pandas as pd
 import sys
-sys.path.insert(0, 'C:\\Proyectos\\agile-metrics')
+sys.path.insert(0, 'C:\\Proyectos\\agile-metrics\\metrics_analyzer')
 
-# Leer el archivo Excel
-file_path = r'C:\Proyectos\agile-metrics\Backlog_Planning_No_paquetizado_All_Tasks_1768419897.xlsx'
-df_raw = pd.read_excel(file_path, header=1)
+from excel_cache import load_monday_excel
 
-# La primera fila contiene los nombres reales de las columnas
-new_columns = df_raw.iloc[0].tolist()
-df = df_raw.iloc[1:].copy()
-df.columns = new_columns
-df.reset_index(drop=True, inplace=True)
+# Leer el archivo Excel (con caché en disco)
+file_path = r'C:\Proyectos\agile-metrics\Backlog_Planning_No_paquetizado_All_Tasks_1768419897.xlsx'
+df = load_monday_excel(file_path)
 
 print("=" * 80)
 print("ESTRUCTURA DEL ARCHIVO")
@@ -37,10 +32,10 @@ important_cols = ['Estado', 'Tipo Tarea', 'Sprint', 'Sprint Completed?']
 for col in important_cols:
     if col in df.columns:
         unique_vals = df[col].dropna().unique()
+        # Conteos de todos los valores en una sola pasada
+        counts = df[col].value_counts()
         print(f"\n{col} ({len(unique_vals)} valores únicos):")
-        for val in sorted(unique_vals, key=str):
-            count = (df[col] == val).sum()
-            print(f"  - {val}: {count} tareas")
+        print("\n".join(f"  - {val}: {counts[val]} tareas" for val in sorted(unique_vals, key=str)))
 
 print("\n" + "=" * 80)
 print("RESUMEN DE DATOS NUMÉRICOS")
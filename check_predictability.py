@@ -2,36 +2,22 @@
 Script para verificar el cálculo de predictabilidad antes de modificar.
 """
 import pandas as pd
+import numpy as np
 import sys
 sys.path.insert(0, 'C:\\Proyectos\\agile-metrics\\metrics_analyzer')
 
-from config import DELIVERY_STATES_PRODUCTIVE
+from config import DELIVERY_STATES_PRODUCTIVE, PREDICTABILITY_COLUMNS
+from excel_cache import load_monday_excel
+from utils import isin_categorical
 
 # Configuración
 file_path = r'C:\Proyectos\agile-metrics\Backlog_Planning_No_paquetizado_All_Tasks_1768419897.xlsx'
 
-# Leer archivo
-df_raw = pd.read_excel(file_path, header=1)
-new_columns = df_raw.iloc[0].tolist()
-df = df_raw.iloc[1:].copy()
-
-# Manejar columnas duplicadas
-cols = pd.Series(new_columns)
-for dup in cols[cols.duplicated()].unique():
-    dup_indices = [i for i, x in enumerate(new_columns) if x == dup]
-    for i, idx in enumerate(dup_indices):
-        if i > 0:
-            new_columns[idx] = f"{dup}_{i}"
-
-df.columns = new_columns
-df.reset_index(drop=True, inplace=True)
-
-# Convertir Estimación Original a numérico
-df['Estimación Original'] = pd.to_numeric(df['Estimación Original'], errors='coerce')
-df['Puntos Logrados'] = pd.to_numeric(df['Puntos Logrados'], errors='coerce')
+# Leer archivo (con caché en disco y columnas numéricas convertidas)
+df = load_monday_excel(file_path, columns=PREDICTABILITY_COLUMNS)
 
 # Identificar tareas en DoD
-df['Is_DoD'] = df['Estado'].isin(DELIVERY_STATES_PRODUCTIVE)
+df['Is_DoD'] = isin_categorical(df['Estado'], DELIVERY_STATES_PRODUCTIVE)
 
 print("=" * 80)
 print("ANÁLISIS DE PREDICTABILIDAD - PUNTOS ESTIMADOS QUE ALCANZARON DoD")
@@ -43,49 +29,72 @@ print()
 # Filtrar filas con Sprint válido
 df = df[df['Sprint'].notna()]
 
-# Análisis por sprint
-sprints = sorted(df['Sprint'].dropna().unique(), key=lambda x: int(str(x).split()[-1]) if 'Sprint' in str(x) else 0)
+# Análisis por sprint (la categoría 'Sprint' ya viene ordenada por número de sprint)
 
 print("=" * 80)
 print("DETALLE POR SPRINT")
 print("=" * 80)
 print()
 
-total_committed_all = 0
-total_delivered_all = 0
-
-for sprint in sprints:
-    sprint_data = df[df['Sprint'] == sprint]
-    dod_tasks = sprint_data[sprint_data['Is_DoD']]
+# Agregación por sprint: np.bincount sobre arrays NumPy extraídos una sola vez
+sprint_codes, sprint_names = pd.factorize(df['Sprint'], sort=True)
+estimation = df['Estimación Original'].to_numpy(dtype=np.float64, na_value=0.0)
+achieved = df['Puntos Logrados'].to_numpy(dtype=np.float64, na_value=0.0)
+is_dod = df['Is_DoD'].to_numpy(dtype=bool)
+n_sprints = len(sprint_names)
+
+sprint_agg = pd.DataFrame(
+    {
+        'committed': np.bincount(sprint_codes, weights=estimation, minlength=n_sprints),
+        'delivered': np.bincount(sprint_codes, weights=estimation * is_dod, minlength=n_sprints),
+        'achieved': np.bincount(sprint_codes, weights=achieved * is_dod, minlength=n_sprints),
+        'n_tasks': np.bincount(sprint_codes, minlength=n_sprints),
+        'n_dod': np.bincount(sprint_codes, weights=is_dod, minlength=n_sprints).astype(int),
+    },
+    index=pd.Index(np.asarray(sprint_names)),
+)
+
+# Desglose por estado DoD (ordenado por sprint y estado)
+dod_by_state = (
+    df[df['Is_DoD']]
+    .groupby(['Sprint', 'Estado'], observed=True)
+    .agg(n_tasks=('Estado', 'size'), points=('Estimación Original', 'sum'))
+)
+
+# El detalle se arma en memoria y se escribe de una sola vez
+lines = []
+for row in sprint_agg.itertuples():
+    sprint = row.Index
 
     # Puntos comprometidos: TODAS las tareas del sprint
-    committed_points = sprint_data['Estimación Original'].sum()
+    committed_points = row.committed
 
     # Puntos entregados (DoD): Solo tareas que alcanzaron DoD
-    delivered_points = dod_tasks['Estimación Original'].sum()
+    delivered_points = row.delivered
 
     # Predictabilidad
     predictability = (delivered_points / committed_points * 100) if committed_points > 0 else 0
 
-    total_committed_all += committed_points
-    total_delivered_all += delivered_points
-
-    print(f"{sprint}")
-    print(f"  Total tareas en sprint: {len(sprint_data)}")
-    print(f"  Tareas que alcanzaron DoD: {len(dod_tasks)}")
-    print(f"  Puntos comprometidos (Estimación Original de TODAS las tareas): {committed_points:.1f}")
-    print(f"  Puntos entregados (Estimación Original de tareas en DoD): {delivered_points:.1f}")
-    print(f"  Predictabilidad calculada: {predictability:.1f}%")
+    lines.append(f"{sprint}")
+    lines.append(f"  Total tareas en sprint: {row.n_tasks}")
+    lines.append(f"  Tareas que alcanzaron DoD: {row.n_dod}")
+    lines.append(f"  Puntos comprometidos (Estimación Original de TODAS las tareas): {committed_points:.1f}")
+    lines.append(f"  Puntos entregados (Estimación Original de tareas en DoD): {delivered_points:.1f}")
+    lines.append(f"  Predictabilidad calculada: {predictability:.1f}%")
 
     # Desglose por estado DoD
-    if len(dod_tasks) > 0:
-        print(f"  Desglose por estado DoD:")
-        for estado in sorted(dod_tasks['Estado'].unique()):
-            estado_tasks = dod_tasks[dod_tasks['Estado'] == estado]
-            estado_points = estado_tasks['Estimación Original'].sum()
-            print(f"    - {estado}: {len(estado_tasks)} tareas, {estado_points:.1f} puntos")
+    if row.n_dod > 0:
+        lines.append(f"  Desglose por estado DoD:")
+        for estado, estado_row in dod_by_state.loc[sprint].iterrows():
+            lines.append(f"    - {estado}: {int(estado_row['n_tasks'])} tareas, {estado_row['points']:.1f} puntos")
+
+    lines.append("")
+
+if lines:
+    print("\n".join(lines))
 
-    print()
+total_committed_all = sprint_agg['committed'].sum()
+total_delivered_all = sprint_agg['delivered'].sum()
 
 print("=" * 80)
 print("RESUMEN GENERAL")
@@ -101,16 +110,16 @@ print("COMPARACIÓN: ESTIMACIÓN ORIGINAL vs PUNTOS LOGRADOS (tareas en DoD)")
 print("=" * 80)
 print()
 
-for sprint in sprints:
-    sprint_data = df[df['Sprint'] == sprint]
-    dod_tasks = sprint_data[sprint_data['Is_DoD']]
+lines = []
+for row in sprint_agg[sprint_agg['n_dod'] > 0].itertuples():
+    delivered_estimation = row.delivered
+    delivered_achieved = row.achieved
 
-    if len(dod_tasks) > 0:
-        delivered_estimation = dod_tasks['Estimación Original'].sum()
-        delivered_achieved = dod_tasks['Puntos Logrados'].sum()
+    lines.append(f"{row.Index}")
+    lines.append(f"  Puntos de Estimación Original (tareas DoD): {delivered_estimation:.1f}")
+    lines.append(f"  Puntos Logrados (tareas DoD): {delivered_achieved:.1f}")
+    lines.append(f"  Diferencia: {(delivered_achieved - delivered_estimation):.1f}")
+    lines.append("")
 
-        print(f"{sprint}")
-        print(f"  Puntos de Estimación Original (tareas DoD): {delivered_estimation:.1f}")
-        print(f"  Puntos Logrados (tareas DoD): {delivered_achieved:.1f}")
-        print(f"  Diferencia: {(delivered_achieved - delivered_estimation):.1f}")
-        print()
+if lines:
+    print("\n".join(lines))
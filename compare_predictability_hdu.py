@@ -2,113 +2,107 @@
 Script para comparar predictabilidad: todas las tareas vs solo HDU.
 """
 import pandas as pd
+import numpy as np
 import sys
 sys.path.insert(0, 'C:\\Proyectos\\agile-metrics\\metrics_analyzer')
 
-from config import DELIVERY_STATES_PRODUCTIVE
+from config import DELIVERY_STATES_PRODUCTIVE, PREDICTABILITY_COLUMNS
+from excel_cache import load_monday_excel
+from utils import isin_categorical
 
 # Configuración
 file_path = r'C:\Proyectos\agile-metrics\Backlog_Planning_No_paquetizado_All_Tasks_1768419897.xlsx'
 
-# Leer archivo
-df_raw = pd.read_excel(file_path, header=1)
-new_columns = df_raw.iloc[0].tolist()
-df = df_raw.iloc[1:].copy()
-
-# Manejar columnas duplicadas
-cols = pd.Series(new_columns)
-for dup in cols[cols.duplicated()].unique():
-    dup_indices = [i for i, x in enumerate(new_columns) if x == dup]
-    for i, idx in enumerate(dup_indices):
-        if i > 0:
-            new_columns[idx] = f"{dup}_{i}"
-
-df.columns = new_columns
-df.reset_index(drop=True, inplace=True)
-
-# Convertir columnas numéricas
-df['Estimación Original'] = pd.to_numeric(df['Estimación Original'], errors='coerce')
-df['Puntos Logrados'] = pd.to_numeric(df['Puntos Logrados'], errors='coerce')
+# Leer archivo (con caché en disco y columnas numéricas convertidas)
+df = load_monday_excel(file_path, columns=PREDICTABILITY_COLUMNS)
 
 # Identificar tareas en DoD
-df['Is_DoD'] = df['Estado'].isin(DELIVERY_STATES_PRODUCTIVE)
+df['Is_DoD'] = isin_categorical(df['Estado'], DELIVERY_STATES_PRODUCTIVE)
 
 # Filtrar filas con Sprint válido
 df = df[df['Sprint'].notna()]
 
-# Análisis por sprint
-sprints = sorted(df['Sprint'].dropna().unique(), key=lambda x: int(str(x).split()[-1]) if 'Sprint' in str(x) else 0)
+# Análisis por sprint (la categoría 'Sprint' ya viene ordenada por número de sprint)
 
 print("=" * 80)
 print("COMPARATIVA DE PREDICTABILIDAD: TODAS LAS TAREAS vs SOLO HDU")
 print("=" * 80)
 print()
 
-# Tabla comparativa
-results = []
-
-for sprint in sprints:
-    sprint_data = df[df['Sprint'] == sprint]
-    sprint_hdu = sprint_data[sprint_data['Tipo Tarea'] == 'HDU']
-
-    # === TODAS LAS TAREAS ===
-    dod_all = sprint_data[sprint_data['Is_DoD']]
-    committed_all = sprint_data['Estimación Original'].sum()
-    delivered_all = dod_all['Estimación Original'].sum()
-    pred_all = (delivered_all / committed_all * 100) if committed_all > 0 else 0
-
-    # === SOLO HDU ===
-    dod_hdu = sprint_hdu[sprint_hdu['Is_DoD']]
-    committed_hdu = sprint_hdu['Estimación Original'].sum()
-    delivered_hdu = dod_hdu['Estimación Original'].sum()
-    pred_hdu = (delivered_hdu / committed_hdu * 100) if committed_hdu > 0 else 0
-
-    # === DIFERENCIA ===
-    diff = pred_hdu - pred_all
-
-    results.append({
-        'Sprint': sprint,
-        'Total_Tasks_All': len(sprint_data),
-        'DoD_Tasks_All': len(dod_all),
-        'Committed_All': committed_all,
-        'Delivered_All': delivered_all,
-        'Pred_All': pred_all,
-        'Total_Tasks_HDU': len(sprint_hdu),
-        'DoD_Tasks_HDU': len(dod_hdu),
-        'Committed_HDU': committed_hdu,
-        'Delivered_HDU': delivered_hdu,
-        'Pred_HDU': pred_hdu,
-        'Diff': diff
-    })
+# Tabla comparativa: sumas por sprint con np.bincount sobre arrays NumPy extraídos
+# una sola vez (todas las tareas y solo HDU)
+sprint_codes, sprint_names = pd.factorize(df['Sprint'], sort=True)
+estimation = df['Estimación Original'].to_numpy(dtype=np.float64, na_value=0.0)
+is_dod = df['Is_DoD'].to_numpy(dtype=bool)
+is_hdu = (df['Tipo Tarea'] == 'HDU').to_numpy(dtype=bool)
+is_dod_hdu = is_dod & is_hdu
+
+
+def sum_by_sprint(weights=None):
+    """Suma weights por sprint (o cuenta filas si weights es None)."""
+    return np.bincount(sprint_codes, weights=weights, minlength=len(sprint_names))
+
+
+sprint_agg = pd.DataFrame(
+    {
+        'Total_Tasks_All': sum_by_sprint(),
+        'DoD_Tasks_All': sum_by_sprint(is_dod).astype(int),
+        'Committed_All': sum_by_sprint(estimation),
+        'Delivered_All': sum_by_sprint(estimation * is_dod),
+        'Total_Tasks_HDU': sum_by_sprint(is_hdu).astype(int),
+        'DoD_Tasks_HDU': sum_by_sprint(is_dod_hdu).astype(int),
+        'Committed_HDU': sum_by_sprint(estimation * is_hdu),
+        'Delivered_HDU': sum_by_sprint(estimation * is_dod_hdu),
+    },
+    index=pd.Index(np.asarray(sprint_names)),
+)
+
+# === PREDICTABILIDAD (0 si no hay puntos comprometidos) ===
+sprint_agg['Pred_All'] = (
+    sprint_agg['Delivered_All'] / sprint_agg['Committed_All'] * 100
+).where(sprint_agg['Committed_All'] > 0, 0)
+sprint_agg['Pred_HDU'] = (
+    sprint_agg['Delivered_HDU'] / sprint_agg['Committed_HDU'] * 100
+).where(sprint_agg['Committed_HDU'] > 0, 0)
+
+# === DIFERENCIA ===
+sprint_agg['Diff'] = sprint_agg['Pred_HDU'] - sprint_agg['Pred_All']
+
+results = sprint_agg.rename_axis('Sprint').reset_index().to_dict('records')
 
 # Mostrar resultados
 print("DETALLE POR SPRINT:")
 print()
 
+# El detalle se arma en memoria y se escribe de una sola vez
+lines = []
 for r in results:
-    print(f"{'-' * 80}")
-    print(f"{r['Sprint']}")
-    print(f"{'-' * 80}")
-    print()
-
-    print("  TODAS LAS TAREAS (HDU + Bug + Solicitud):")
-    print(f"    Total tareas: {r['Total_Tasks_All']}")
-    print(f"    Tareas en DoD: {r['DoD_Tasks_All']}")
-    print(f"    Puntos comprometidos: {r['Committed_All']:.1f}")
-    print(f"    Puntos entregados: {r['Delivered_All']:.1f}")
-    print(f"    Predictabilidad: {r['Pred_All']:.1f}%")
-    print()
-
-    print("  SOLO TAREAS HDU:")
-    print(f"    Total tareas HDU: {r['Total_Tasks_HDU']}")
-    print(f"    Tareas HDU en DoD: {r['DoD_Tasks_HDU']}")
-    print(f"    Puntos comprometidos (HDU): {r['Committed_HDU']:.1f}")
-    print(f"    Puntos entregados (HDU): {r['Delivered_HDU']:.1f}")
-    print(f"    Predictabilidad (HDU): {r['Pred_HDU']:.1f}%")
-    print()
-
-    print(f"  DIFERENCIA: {r['Diff']:+.1f}% {'(HDU mejor)' if r['Diff'] > 0 else '(HDU peor)' if r['Diff'] < 0 else '(igual)'}")
-    print()
+    lines.append(f"{'-' * 80}")
+    lines.append(f"{r['Sprint']}")
+    lines.append(f"{'-' * 80}")
+    lines.append("")
+
+    lines.append("  TODAS LAS TAREAS (HDU + Bug + Solicitud):")
+    lines.append(f"    Total tareas: {r['Total_Tasks_All']}")
+    lines.append(f"    Tareas en DoD: {r['DoD_Tasks_All']}")
+    lines.append(f"    Puntos comprometidos: {r['Committed_All']:.1f}")
+    lines.append(f"    Puntos entregados: {r['Delivered_All']:.1f}")
+    lines.append(f"    Predictabilidad: {r['Pred_All']:.1f}%")
+    lines.append("")
+
+    lines.append("  SOLO TAREAS HDU:")
+    lines.append(f"    Total tareas HDU: {r['Total_Tasks_HDU']}")
+    lines.append(f"    Tareas HDU en DoD: {r['DoD_Tasks_HDU']}")
+    lines.append(f"    Puntos comprometidos (HDU): {r['Committed_HDU']:.1f}")
+    lines.append(f"    Puntos entregados (HDU): {r['Delivered_HDU']:.1f}")
+    lines.append(f"    Predictabilidad (HDU): {r['Pred_HDU']:.1f}%")
+    lines.append("")
+
+    lines.append(f"  DIFERENCIA: {r['Diff']:+.1f}% {'(HDU mejor)' if r['Diff'] > 0 else '(HDU peor)' if r['Diff'] < 0 else '(igual)'}")
+    lines.append("")
+
+if lines:
+    print("\n".join(lines))
 
 # Resumen en tabla
 print("=" * 80)
@@ -118,9 +112,12 @@ print()
 
 print(f"{'Sprint':<12} {'Pred All':<12} {'Pred HDU':<12} {'Diferencia':<15} {'Comentario'}")
 print("-" * 80)
+lines = []
 for r in results:
     comentario = "HDU mejor" if r['Diff'] > 5 else "HDU peor" if r['Diff'] < -5 else "Similar"
-    print(f"{r['Sprint']:<12} {r['Pred_All']:>6.1f}%     {r['Pred_HDU']:>6.1f}%     {r['Diff']:>+6.1f}%         {comentario}")
+    lines.append(f"{r['Sprint']:<12} {r['Pred_All']:>6.1f}%     {r['Pred_HDU']:>6.1f}%     {r['Diff']:>+6.1f}%         {comentario}")
+if lines:
+    print("\n".join(lines))
 
 # Totales globales
 total_committed_all = sum(r['Committed_All'] for r in results)
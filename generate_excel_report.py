@@ -1,19 +1,19 @@
 """
 Script para generar el reporte Excel con todas las métricas.
 """
-import pandas as pd
 import sys
 sys.path.insert(0, 'C:\\Proyectos\\agile-metrics\\metrics_analyzer')
 
 from data_processor import DataProcessor
 from metrics_calculator import MetricsCalculator
-from report_generator import generate_excel_report
+from excel_cache import load_monday_excel
 
 # Configuración
 file_path = r'C:\Proyectos\agile-metrics\Backlog_Planning_No_paquetizado_All_Tasks_1768419897.xlsx'
 team_type = 'Productivo'
 team_size = 6
 output_file = 'Metricas_Performance_Equipo.xlsx'
+output_format = 'xlsx'  # 'pickle' para guardar solo los resultados (sin formato, más rápido)
 
 # Mapeo de sprints a meses
 sprint_mapping = {
@@ -40,20 +40,8 @@ print()
 
 try:
     # Leer archivo (manejo especial para el formato de Monday)
-    df_raw = pd.read_excel(file_path, header=1)
-    new_columns = df_raw.iloc[0].tolist()
-    df = df_raw.iloc[1:].copy()
-
-    # Manejar columnas duplicadas: agregar sufijos
-    cols = pd.Series(new_columns)
-    for dup in cols[cols.duplicated()].unique():
-        dup_indices = [i for i, x in enumerate(new_columns) if x == dup]
-        for i, idx in enumerate(dup_indices):
-            if i > 0:  # Mantener la primera sin sufijo
-                new_columns[idx] = f"{dup}_{i}"
-
-    df.columns = new_columns
-    df.reset_index(drop=True, inplace=True)
+    # La conversión de tipos la realiza DataProcessor (acepta decimales con coma)
+    df = load_monday_excel(file_path, coerce_numeric=False, as_category=False)
 
     # Agregar columna "Sprint Completed?" = 'v' para todos (asumir completados)
     df['Sprint Completed?'] = 'v'
@@ -62,7 +50,7 @@ try:
     date_cols = ['Fecha Término', 'Fecha Ready for Production', 'Fecha paso a Producción']
     delivery_date_column = 'Fecha Término'  # Por defecto
     for col in date_cols:
-        if col in df.columns and df[col].notna().sum() > 0:
+        if col in df.columns and df[col].notna().any():
             delivery_date_column = col
             break
 
@@ -94,13 +82,16 @@ try:
     print(f"Métricas por mes: {len(month_metrics)} meses")
     print()
 
-    # Generar reporte Excel
+    # Generar reporte Excel (xlsxwriter solo se importa si se llega a este paso)
     print("Generando reporte Excel...")
+    from report_generator import generate_excel_report
+
     output_path = generate_excel_report(
         sprint_metrics=sprint_metrics,
         month_metrics=month_metrics,
         summary=summary,
-        output_path=output_file
+        output_path=output_file,
+        output_format=output_format
     )
 
     print()
@@ -5,29 +5,54 @@ Este módulo permite procesar múltiples archivos Excel de diferentes
 equipos y generar métricas consolidadas.
 """
 
+import contextlib
+import hashlib
+import io
 import logging
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Literal
+from typing import Dict, Iterator, List, Tuple, Optional, Literal
 from dataclasses import dataclass
 import pandas as pd
 
 from config import (
     DEVELOPMENT_TEAMS,
     BATCH_CONFIG,
+    CACHE_VERSION,
     DEFAULT_TEAM_SIZE,
     DEFAULT_SPRINT_MAPPING,
     DELIVERY_DATE_COLUMNS_PRODUCTIVE,
     DELIVERY_DATE_COLUMNS_DEVELOPMENT,
+    DELIVERY_STATES_PRODUCTIVE,
+    DELIVERY_STATES_DEVELOPMENT,
+    REQUIRED_COLUMNS,
+    OPTIONAL_COLUMNS,
+    TASK_TYPES_TO_TRACK,
+    TASK_TYPE_ALIASES,
+    TASK_TYPE_DISPLAY_ORDER,
+    AUTO_DETECT_TASK_TYPES,
+    SPRINT_REFERENCE_NUMBER,
+    SPRINT_REFERENCE_END_DATE,
+    SPRINT_DURATION_DAYS,
+    SPRINT_END_DAY_OF_WEEK,
+    COPY_SUFFIXES,
+    HOLIDAYS,
 )
-from data_loader import load_and_validate_data
-from data_processor import process_data
-from metrics_calculator import MetricsCalculator
-from utils import print_info, print_success, print_warning, print_error
+from utils import setup_logging, print_info, print_success, print_warning, print_error
 
 
 logger = logging.getLogger(__name__)
 
+# Expresión regular para extraer el nombre del equipo (compilada una sola vez)
+_TEAM_NAME_RE = re.compile(BATCH_CONFIG['team_name_regex'])
+
+# Nombres de equipos en desarrollo normalizados (precalculados)
+_DEV_TEAMS_CF = tuple(team.strip().casefold() for team in DEVELOPMENT_TEAMS)
+_DEV_TEAMS_SET = frozenset(_DEV_TEAMS_CF)
+
 
 @dataclass
 class TeamResult:
@@ -43,6 +68,86 @@ class TeamResult:
     error_message: Optional[str] = None
 
 
+def _config_fingerprint() -> str:
+    """
+    Calcula una huella de la configuración que afecta a los resultados.
+
+    Returns:
+        Hash hexadecimal de los valores de config usados al cargar, procesar
+        y calcular las métricas de un equipo.
+    """
+    values = (
+        DEFAULT_SPRINT_MAPPING,
+        DELIVERY_DATE_COLUMNS_PRODUCTIVE,
+        DELIVERY_DATE_COLUMNS_DEVELOPMENT,
+        DELIVERY_STATES_PRODUCTIVE,
+        DELIVERY_STATES_DEVELOPMENT,
+        REQUIRED_COLUMNS,
+        OPTIONAL_COLUMNS,
+        TASK_TYPES_TO_TRACK,
+        TASK_TYPE_ALIASES,
+        TASK_TYPE_DISPLAY_ORDER,
+        AUTO_DETECT_TASK_TYPES,
+        SPRINT_REFERENCE_NUMBER,
+        SPRINT_REFERENCE_END_DATE,
+        SPRINT_DURATION_DAYS,
+        SPRINT_END_DAY_OF_WEEK,
+        COPY_SUFFIXES,
+        HOLIDAYS,
+    )
+    return hashlib.sha256(repr(values).encode('utf-8')).hexdigest()
+
+
+def _init_worker(verbose: bool) -> None:
+    """
+    Inicializa un proceso del pool con la misma configuración de logging
+    que el proceso principal.
+
+    Args:
+        verbose: Si es True, muestra logs de nivel DEBUG.
+    """
+    setup_logging(verbose)
+
+
+def _process_team_in_worker(
+    processor: 'BatchProcessor',
+    file_path: Path,
+    team_name: str
+) -> Tuple[TeamResult, str, str]:
+    """
+    Procesa un equipo en un proceso del pool capturando su salida de consola.
+
+    Lo que imprime el equipo y sus mensajes de log se devuelven al proceso
+    principal para mostrarlos juntos, en lugar de mezclarse con los de otros
+    equipos.
+
+    Args:
+        processor: Procesador batch (con la configuración de la ejecución).
+        file_path: Ruta al archivo Excel.
+        team_name: Nombre del equipo.
+
+    Returns:
+        Tupla (TeamResult, texto impreso, texto de log).
+    """
+    output = io.StringIO()
+    log_output = io.StringIO()
+
+    # Solo los handlers de consola (no los de archivo) se redirigen
+    console_handlers = [
+        handler for handler in logging.getLogger().handlers
+        if type(handler) is logging.StreamHandler
+    ]
+    previous_streams = [handler.setStream(log_output) for handler in console_handlers]
+    try:
+        with contextlib.redirect_stdout(output):
+            result = processor.process_single_team(file_path, team_name)
+    finally:
+        for handler, stream in zip(console_handlers, previous_streams):
+            handler.setStream(stream)
+
+    return result, output.getvalue(), log_output.getvalue()
+
+
 class BatchProcessor:
     """Procesador batch de múltiples archivos de equipos."""
 
@@ -74,26 +179,31 @@ class BatchProcessor:
         if not self.folder_path.is_dir():
             raise ValueError(f"La ruta no es una carpeta: {folder_path}")
 
-    def discover_files(self) -> List[Tuple[Path, str]]:
+    def iter_discovered_files(self) -> Iterator[Tuple[Path, str]]:
         """
-        Descubre archivos válidos y extrae nombres de equipos.
+        Recorre la carpeta entregando archivos válidos a medida que se encuentran.
 
-        Returns:
-            Lista de tuplas (path_archivo, nombre_equipo).
+        Yields:
+            Tuplas (path_archivo, nombre_equipo).
         """
         pattern = BATCH_CONFIG['file_pattern']
-        files = list(self.folder_path.glob(pattern))
 
-        discovered = []
-        for file_path in files:
+        for file_path in self.folder_path.glob(pattern):
             team_name = self._extract_team_name(file_path.name)
             if team_name:
-                discovered.append((file_path, team_name))
                 logger.info(f"Archivo descubierto: {file_path.name} -> Equipo: {team_name}")
+                yield file_path, team_name
             else:
                 logger.warning(f"No se pudo extraer nombre de equipo: {file_path.name}")
 
-        return discovered
+    def discover_files(self) -> List[Tuple[Path, str]]:
+        """
+        Descubre archivos válidos y extrae nombres de equipos.
+
+        Returns:
+            Lista de tuplas (path_archivo, nombre_equipo).
+        """
+        return list(self.iter_discovered_files())
 
     def _extract_team_name(self, filename: str) -> Optional[str]:
         """
@@ -107,8 +217,7 @@ class BatchProcessor:
         Returns:
             Nombre del equipo o None si no se puede extraer.
         """
-        regex = BATCH_CONFIG['team_name_regex']
-        match = re.search(regex, filename)
+        match = _TEAM_NAME_RE.search(filename)
 
         if match:
             team_name = match.group(1)
@@ -126,12 +235,18 @@ class BatchProcessor:
         Returns:
             'En Desarrollo' si está en DEVELOPMENT_TEAMS, 'Productivo' en caso contrario.
         """
-        team_name_normalized = team_name.strip().upper()
+        team_name_normalized = team_name.strip().casefold()
 
-        for dev_team in DEVELOPMENT_TEAMS:
-            dev_team_normalized = dev_team.upper()
-            if dev_team_normalized in team_name_normalized or team_name_normalized in dev_team_normalized:
-                return 'En Desarrollo'
+        # Coincidencia exacta (caso más común)
+        if team_name_normalized in _DEV_TEAMS_SET:
+            return 'En Desarrollo'
+
+        # Coincidencia parcial en cualquier dirección
+        if any(
+            dev_team in team_name_normalized or team_name_normalized in dev_team
+            for dev_team in _DEV_TEAMS_CF
+        ):
+            return 'En Desarrollo'
 
         return 'Productivo'
 
@@ -166,7 +281,7 @@ class BatchProcessor:
             default = 'Fecha Certificado QA'
 
         for col in date_columns:
-            if col in df.columns and df[col].notna().sum() > 0:
+            if col in df.columns and df[col].notna().any():
                 return col
 
         return default
@@ -186,12 +301,24 @@ class BatchProcessor:
         Returns:
             TeamResult con los resultados del procesamiento.
         """
+        # Importaciones diferidas: el descubrimiento de archivos no las necesita
+        # y cada proceso del pool las carga solo al procesar su primer equipo
+        from data_loader import load_and_validate_data
+        from data_processor import process_data
+        from metrics_calculator import MetricsCalculator
+
         team_type = self._determine_team_type(team_name)
         team_size = self._get_team_size(team_name)
 
         logger.info(f"Procesando equipo: {team_name} (Tipo: {team_type}, Tamaño: {team_size})")
 
         try:
+            cache_key = self._result_cache_key(file_path, team_type, team_size)
+            cached = self._load_cached_result(team_name, cache_key)
+            if cached is not None:
+                logger.info(f"Usando resultados en caché para: {team_name}")
+                return cached
+
             # 1. Cargar y validar datos
             df = load_and_validate_data(str(file_path), verbose=self.verbose)
 
@@ -208,23 +335,16 @@ class BatchProcessor:
             )
 
             if len(processed_df) == 0:
-                return TeamResult(
-                    team_name=team_name,
-                    team_type=team_type,
-                    team_size=team_size,
-                    sprint_metrics=pd.DataFrame(),
-                    month_metrics=pd.DataFrame(),
-                    summary={},
-                    file_path=str(file_path),
-                    success=False,
-                    error_message="No hay datos válidos después del procesamiento"
+                return self._failed_result(
+                    file_path, team_name,
+                    "No hay datos válidos después del procesamiento"
                 )
 
             # 4. Calcular métricas
             calculator = MetricsCalculator(processed_df, team_size)
             calculator.calculate_all_metrics()
 
-            return TeamResult(
+            result = TeamResult(
                 team_name=team_name,
                 team_type=team_type,
                 team_size=team_size,
@@ -234,51 +354,223 @@ class BatchProcessor:
                 file_path=str(file_path),
                 success=True
             )
+            self._save_cached_result(team_name, cache_key, result)
+
+            return result
 
         except Exception as e:
             logger.error(f"Error procesando {team_name}: {e}")
-            return TeamResult(
-                team_name=team_name,
-                team_type=team_type,
-                team_size=team_size,
-                sprint_metrics=pd.DataFrame(),
-                month_metrics=pd.DataFrame(),
-                summary={},
-                file_path=str(file_path),
-                success=False,
-                error_message=str(e)
-            )
+            return self._failed_result(file_path, team_name, str(e))
 
-    def process_all(self) -> List[TeamResult]:
+    def _result_cache_key(self, file_path: Path, team_type: str, team_size: int) -> Tuple:
         """
-        Procesa todos los archivos descubiertos.
+        Construye la clave que identifica los datos de entrada de un equipo.
+
+        Args:
+            file_path: Ruta al archivo Excel.
+            team_type: Tipo de equipo.
+            team_size: Tamaño del equipo.
 
         Returns:
-            Lista de TeamResult con resultados de cada equipo.
+            Tupla con versión de la caché, huella de la configuración, ruta,
+            fecha de modificación y tamaño del archivo, tipo y tamaño del
+            equipo y mapeo de sprints (en su orden).
+
+        Raises:
+            OSError: Si no se puede acceder al archivo.
         """
-        discovered_files = self.discover_files()
+        stat = Path(file_path).stat()
+        return (
+            CACHE_VERSION,
+            _config_fingerprint(),
+            str(Path(file_path).resolve()),
+            stat.st_mtime_ns,
+            stat.st_size,
+            team_type,
+            team_size,
+            # El orden importa: cada sprint toma el mes de la primera clave que contiene
+            tuple(self.sprint_mapping.items()),
+        )
+
+    def _result_cache_path(self, team_name: str) -> Optional[Path]:
+        """
+        Obtiene la ruta de la caché de resultados de un equipo.
 
-        if not discovered_files:
+        Args:
+            team_name: Nombre del equipo.
+
+        Returns:
+            Ruta del archivo de caché o None si la caché está desactivada.
+        """
+        cache_dir = BATCH_CONFIG.get('result_cache_dir')
+        if not cache_dir:
+            return None
+        return Path(cache_dir) / f"{team_name}.pkl"
+
+    def _load_cached_result(self, team_name: str, cache_key: Tuple) -> Optional[TeamResult]:
+        """
+        Lee los resultados de un equipo desde la caché si siguen vigentes.
+
+        Args:
+            team_name: Nombre del equipo.
+            cache_key: Clave de los datos de entrada actuales.
+
+        Returns:
+            TeamResult en caché o None si no existe o no corresponde.
+        """
+        cache_path = self._result_cache_path(team_name)
+        if cache_path is None or not cache_path.exists():
+            return None
+
+        try:
+            cached = pd.read_pickle(cache_path)
+        except Exception as e:
+            logger.warning(f"No se pudo leer la caché {cache_path}: {e}")
+            return None
+
+        # Un archivo con otro formato (o de otra versión) se trata como ausente
+        if not isinstance(cached, dict) or cached.get('key') != cache_key:
+            return None
+
+        result = cached.get('result')
+        return result if isinstance(result, TeamResult) else None
+
+    def _save_cached_result(self, team_name: str, cache_key: Tuple, result: TeamResult) -> None:
+        """
+        Guarda los resultados de un equipo en la caché (si está activada).
+
+        Args:
+            team_name: Nombre del equipo.
+            cache_key: Clave de los datos de entrada.
+            result: Resultado a guardar.
+        """
+        cache_path = self._result_cache_path(team_name)
+        if cache_path is None:
+            return
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            pd.to_pickle({'key': cache_key, 'result': result}, cache_path)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar la caché {cache_path}: {e}")
+
+    def _failed_result(self, file_path: Path, team_name: str, error_message: str) -> TeamResult:
+        """
+        Construye un TeamResult de error para un equipo.
+
+        Args:
+            file_path: Ruta al archivo Excel.
+            team_name: Nombre del equipo.
+            error_message: Descripción del error.
+
+        Returns:
+            TeamResult marcado como no exitoso.
+        """
+        return TeamResult(
+            team_name=team_name,
+            team_type=self._determine_team_type(team_name),
+            team_size=self._get_team_size(team_name),
+            sprint_metrics=pd.DataFrame(),
+            month_metrics=pd.DataFrame(),
+            summary={},
+            file_path=str(file_path),
+            success=False,
+            error_message=error_message
+        )
+
+    def _get_max_workers(self) -> int:
+        """
+        Determina cuántos procesos usar para procesar los archivos.
+
+        Returns:
+            Número de procesos (1 = procesamiento secuencial).
+        """
+        return max(1, BATCH_CONFIG.get('max_workers') or os.cpu_count() or 1)
+
+    def _report_discovered(self, n_files: int) -> None:
+        """
+        Informa la cantidad de archivos descubiertos.
+
+        Args:
+            n_files: Cantidad de archivos descubiertos.
+
+        Raises:
+            ValueError: Si no se encontró ningún archivo válido.
+        """
+        if n_files == 0:
             raise ValueError(f"No se encontraron archivos válidos en: {self.folder_path}")
 
-        print_info(f"Se encontraron {len(discovered_files)} archivos para procesar")
+        print_info(f"Se encontraron {n_files} archivos para procesar")
+
+    def process_all(self) -> List[TeamResult]:
+        """
+        Procesa todos los archivos descubiertos.
 
+        Returns:
+            Lista de TeamResult con resultados de cada equipo.
+        """
         self.results = []
-        for file_path, team_name in discovered_files:
-            print_info(f"Procesando: {team_name}...")
-            result = self.process_single_team(file_path, team_name)
-            self.results.append(result)
+        max_workers = self._get_max_workers()
 
-            if result.success:
-                print_success(f"  {team_name}: {result.summary.get('total_delivered', 0)} tareas entregadas")
-            else:
-                print_error(f"  {team_name}: {result.error_message}")
+        if max_workers == 1:
+            discovered_files = self.discover_files()
+            self._report_discovered(len(discovered_files))
+
+            for file_path, team_name in discovered_files:
+                print_info(f"Procesando: {team_name}...")
+                self._add_result(self.process_single_team(file_path, team_name))
+        else:
+            # Cada equipo es independiente: se envía a procesar apenas se descubre
+            # (solapando el recorrido de la carpeta con la lectura de los Excel) y
+            # los resultados se recogen en el orden de descubrimiento
+            logger.info(f"Procesando en paralelo con hasta {max_workers} procesos")
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(self.verbose,)
+            ) as executor:
+                submitted = [
+                    (file_path, team_name, executor.submit(_process_team_in_worker, self, file_path, team_name))
+                    for file_path, team_name in self.iter_discovered_files()
+                ]
+                self._report_discovered(len(submitted))
+
+                for file_path, team_name, future in submitted:
+                    try:
+                        result, output, log_output = future.result()
+                    except Exception as e:
+                        # Errores del proceso hijo no capturados por process_single_team
+                        logger.error(f"Error procesando {team_name}: {e}")
+                        result, output, log_output = self._failed_result(file_path, team_name, str(e)), '', ''
+                    # El equipo ya terminó: sus mensajes se muestran juntos, bajo su nombre
+                    print_info(f"Procesado: {team_name}")
+                    if log_output:
+                        sys.stdout.flush()
+                        sys.stderr.write(log_output)
+                        sys.stderr.flush()
+                    if output:
+                        print(output, end='')
+                    self._add_result(result)
 
         successful = sum(1 for r in self.results if r.success)
         print_info(f"Procesamiento completado: {successful}/{len(self.results)} equipos exitosos")
 
         return self.results
 
+    def _add_result(self, result: TeamResult) -> None:
+        """
+        Agrega un resultado e informa su estado.
+
+        Args:
+            result: Resultado del procesamiento de un equipo.
+        """
+        self.results.append(result)
+
+        if result.success:
+            print_success(f"  {result.team_name}: {result.summary.get('total_delivered', 0)} tareas entregadas")
+        else:
+            print_error(f"  {result.team_name}: {result.error_message}")
+
     def get_successful_results(self) -> List[TeamResult]:
         """Retorna solo los resultados exitosos."""
         return [r for r in self.results if r.success]
@@ -298,8 +590,7 @@ def extract_team_name_from_filename(filename: str) -> Optional[str]:
     Returns:
         Nombre del equipo o None.
     """
-    regex = BATCH_CONFIG['team_name_regex']
-    match = re.search(regex, filename)
+    match = _TEAM_NAME_RE.search(filename)
     if match:
         return match.group(1).strip()
     return None
@@ -315,8 +606,9 @@ def determine_team_type(team_name: str) -> Literal['Productivo', 'En Desarrollo'
     Returns:
         'En Desarrollo' o 'Productivo'.
     """
-    team_name_upper = team_name.strip().upper()
-    for dev_team in DEVELOPMENT_TEAMS:
-        if dev_team.upper() in team_name_upper:
-            return 'En Desarrollo'
+    team_name_normalized = team_name.strip().casefold()
+    if team_name_normalized in _DEV_TEAMS_SET:
+        return 'En Desarrollo'
+    if any(dev_team in team_name_normalized for dev_team in _DEV_TEAMS_CF):
+        return 'En Desarrollo'
     return 'Productivo'
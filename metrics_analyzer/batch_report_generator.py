@@ -6,8 +6,10 @@ una hoja resumen comparativa.
 """
 
 import logging
+import operator
 from pathlib import Path
 from typing import Dict, List, Set
+import numpy as np
 import pandas as pd
 import xlsxwriter
 
@@ -17,10 +19,53 @@ from batch_processor import TeamResult
 
 logger = logging.getLogger(__name__)
 
+# Umbrales de formato condicional (se leen una vez al importar el módulo)
+_PRED_GOOD = THRESHOLDS['predictability_good']
+_PRED_WARN = THRESHOLDS['predictability_warning']
+_REWORK_GOOD = THRESHOLDS['rework_good']
+_REWORK_WARN = THRESHOLDS['rework_warning']
+
+# Columnas fijas de la hoja de cada equipo, en el orden en que se escriben
+# (las columnas de tipos de tareas se agregan dinámicamente al final)
+TEAM_SHEET_COLUMNS: List[str] = [
+    'Sprint', 'Month', 'Throughput', 'Velocity', 'Total_Estimated',
+    'Cycle_Time_Avg', 'Cycle_Time_Median', 'Cycle_Time_HDU_Avg', 'Cycle_Time_HDU_Median',
+    'Predictability', 'Predictability_HDU', 'Efficiency',
+    'Rework', 'Rework_Achieved', 'Rework_Velocity',
+    'Total_Tasks', 'Delivered_Tasks',
+]
+
+# Claves numéricas del summary escritas en cada fila de la hoja resumen
+SUMMARY_ROW_KEYS = (
+    'total_sprints', 'avg_throughput', 'avg_velocity', 'avg_cycle_time',
+    'avg_predictability', 'avg_efficiency', 'avg_rework', 'total_delivered',
+)
+# Extrae todas las claves anteriores en una sola llamada (KeyError si falta alguna)
+_get_summary_row = operator.itemgetter(*SUMMARY_ROW_KEYS)
+
+# Claves del summary que se promedian en la fila 'PROMEDIO GENERAL'
+SUMMARY_AVERAGE_KEYS = (
+    'avg_throughput', 'avg_velocity', 'avg_cycle_time',
+    'avg_predictability', 'avg_efficiency', 'avg_rework',
+)
+
+# Columnas de texto de la hoja de equipo (el resto se completa con 0 si falta)
+TEAM_SHEET_TEXT_COLUMNS = ('Sprint', 'Month')
+
 
 class BatchReportGenerator:
     """Generador de reportes Excel consolidados."""
 
+    # Nombre a mostrar de los tipos de tareas conocidos (clave en minúsculas)
+    _TASK_TYPE_NAMES: Dict[str, str] = {
+        'hdu': 'HDU',
+        'bug': 'Bug',
+        'solicitud': 'Solicitud',
+        'spike': 'Spike',
+        'tech': 'Tech',
+        'backlog': 'Backlog',
+    }
+
     def __init__(
         self,
         results: List[TeamResult],
@@ -33,7 +78,11 @@ class BatchReportGenerator:
             results: Lista de TeamResult con métricas de cada equipo.
             output_path: Ruta donde guardar el archivo Excel.
         """
-        self.results = [r for r in results if r.success]
+        # Resultados exitosos ordenados por nombre de equipo (orden de las hojas)
+        self.results = sorted(
+            (r for r in results if r.success),
+            key=operator.attrgetter('team_name')
+        )
         self.output_path = output_path
         self.workbook = None
         self.formats = {}
@@ -45,6 +94,11 @@ class BatchReportGenerator:
         self.task_types = self._detect_task_types()
         logger.info(f"Tipos de tareas detectados: {', '.join(self.task_types)}")
 
+        # Claves por tipo de tarea en el summary ('hdu_delivered') y en las
+        # métricas por sprint ('HDU_Delivered'), en el mismo orden que task_types
+        self._summary_task_keys = tuple(f'{t.lower()}_delivered' for t in self.task_types)
+        self._team_task_keys = tuple(f'{t}_Delivered' for t in self.task_types)
+
     def _detect_task_types(self) -> List[str]:
         """
         Detecta todos los tipos de tareas presentes en los resultados de los equipos.
@@ -55,21 +109,14 @@ class BatchReportGenerator:
         all_task_types: Set[str] = set()
 
         # Recolectar todos los tipos de tareas del summary de cada equipo
+        suffix = '_delivered'
         for result in self.results:
-            summary = result.summary
-            # Buscar claves que terminen en '_delivered'
-            for key in summary.keys():
-                if key.endswith('_delivered') and key != 'total_delivered':
-                    # Extraer el nombre del tipo (ej: 'hdu_delivered' -> 'HDU')
-                    task_type = key.replace('_delivered', '').upper()
-                    # Primera letra mayúscula, resto como está (ej: 'HDU', 'Bug', 'Solicitud')
-                    if task_type.lower() in ['hdu', 'bug', 'solicitud', 'spike', 'tech', 'backlog']:
-                        # Casos especiales de capitalización
-                        if task_type.lower() == 'hdu':
-                            task_type = 'HDU'
-                        else:
-                            task_type = task_type.capitalize()
-                    all_task_types.add(task_type)
+            # Buscar claves que terminen en '_delivered' (ej: 'hdu_delivered' -> 'HDU')
+            for key in result.summary:
+                if key.endswith(suffix) and key != 'total_delivered':
+                    base = key[:-len(suffix)]
+                    # Tipos conocidos con su capitalización; el resto en mayúsculas
+                    all_task_types.add(self._TASK_TYPE_NAMES.get(base.lower()) or base.upper())
 
         # Ordenar según TASK_TYPE_DISPLAY_ORDER, luego alfabéticamente
         ordered_types = []
@@ -92,14 +139,19 @@ class BatchReportGenerator:
         """
         logger.info(f"Generando reporte consolidado: {self.output_path}")
 
-        self.workbook = xlsxwriter.Workbook(self.output_path, {'nan_inf_to_errors': True})
+        # constant_memory escribe cada fila a disco apenas se completa, por lo que
+        # las hojas deben escribirse estrictamente en orden de filas
+        options = {'constant_memory': True, 'nan_inf_to_errors': True}
+        if BATCH_CONFIG.get('tmpdir'):
+            options['tmpdir'] = BATCH_CONFIG['tmpdir']
+        self.workbook = xlsxwriter.Workbook(self.output_path, options)
         self._create_formats()
 
         # 1. Crear hoja resumen comparativa (primera hoja)
         self._create_summary_sheet()
 
         # 2. Crear una hoja por equipo
-        for result in sorted(self.results, key=lambda r: r.team_name):
+        for result in self.results:
             self._create_team_sheet(result)
 
         self.workbook.close()
@@ -186,17 +238,22 @@ class BatchReportGenerator:
             'border': 1
         })
 
+        # Formatos condicionales indexados por tramo de umbral (ver _get_*_format)
+        self._pred_formats = (self.formats['danger'], self.formats['warning'], self.formats['good'])
+        self._rework_formats = (self.formats['good'], self.formats['warning'], self.formats['danger'])
+
     def _create_summary_sheet(self) -> None:
         """Crea la hoja de resumen comparativo de todos los equipos."""
         sheet_name = BATCH_CONFIG.get('summary_sheet_name', 'Resumen Comparativo')
         worksheet = self.workbook.add_worksheet(sheet_name)
 
         # Configurar anchos dinámicos
+        # (índices numéricos: funcionan con cualquier cantidad de tipos de tareas)
         num_task_type_cols = len(self.task_types)
-        last_col_letter = chr(ord('O') + num_task_type_cols)  # O es la columna base + tipos de tareas
-        worksheet.set_column('A:A', 25)  # Equipo
-        worksheet.set_column('B:B', 15)  # Tipo
-        worksheet.set_column(f'C:{last_col_letter}', 14)  # Métricas
+        last_col = 14 + num_task_type_cols  # 14 (columna O) es la base + tipos de tareas
+        worksheet.set_column(0, 0, 25)  # Equipo
+        worksheet.set_column(1, 1, 15)  # Tipo
+        worksheet.set_column(2, last_col, 14)  # Métricas
 
         row = 0
 
@@ -222,55 +279,53 @@ class BatchReportGenerator:
 
         row += 1
 
+        # Predictibilidad HDU promedio de todos los equipos (una sola agregación)
+        pred_hdu_by_team = self._calculate_avg_predictability_hdu()
+
         # Datos por equipo
-        for result in sorted(self.results, key=lambda r: r.team_name):
+        for result, pred_hdu in zip(self.results, pred_hdu_by_team):
             summary = result.summary
 
+            # Valores del summary leídos una sola vez por equipo (normalmente
+            # están todas las claves; si falta alguna se usa 0)
+            try:
+                row_values = _get_summary_row(summary)
+            except KeyError:
+                row_values = [summary.get(key, 0) for key in SUMMARY_ROW_KEYS]
+            (total_sprints, avg_throughput, avg_velocity, avg_cycle_time,
+             pred, efficiency, rework, total_delivered) = row_values
+            task_counts = [summary.get(key, 0) for key in self._summary_task_keys]
+
             # Formato según tipo de equipo
             team_fmt = self.formats['team_productive'] if result.team_type == 'Productivo' else self.formats['team_development']
 
             worksheet.write(row, 0, result.team_name, team_fmt)
             worksheet.write(row, 1, result.team_type, self.formats['text'])
-            worksheet.write(row, 2, result.team_size, self.formats['integer'])
-            worksheet.write(row, 3, summary.get('total_sprints', 0), self.formats['integer'])
-            worksheet.write(row, 4, summary.get('avg_throughput', 0), self.formats['number'])
-            worksheet.write(row, 5, summary.get('avg_velocity', 0), self.formats['number'])
-            worksheet.write(row, 6, summary.get('avg_cycle_time', 0), self.formats['number'])
+            worksheet.write_row(row, 2, [result.team_size, total_sprints], self.formats['integer'])
+            worksheet.write_row(row, 4, [avg_throughput, avg_velocity, avg_cycle_time], self.formats['number'])
 
             # Predictibilidad con formato condicional
-            pred = summary.get('avg_predictability', 0)
-            pred_fmt = self._get_predictability_format(pred)
-            worksheet.write(row, 7, pred, pred_fmt)
+            worksheet.write(row, 7, pred, self._get_predictability_format(pred))
 
             # Predictibilidad HDU
-            pred_hdu = self._calculate_avg_predictability_hdu(result.sprint_metrics)
-            pred_hdu_fmt = self._get_predictability_format(pred_hdu)
-            worksheet.write(row, 8, pred_hdu, pred_hdu_fmt)
+            worksheet.write(row, 8, pred_hdu, self._get_predictability_format(pred_hdu))
 
-            worksheet.write(row, 9, summary.get('avg_efficiency', 0), self.formats['number'])
+            worksheet.write(row, 9, efficiency, self.formats['number'])
 
             # Retrabajo con formato condicional
-            rework = summary.get('avg_rework', 0)
-            rework_fmt = self._get_rework_format(rework)
-            worksheet.write(row, 10, rework, rework_fmt)
+            worksheet.write(row, 10, rework, self._get_rework_format(rework))
 
-            worksheet.write(row, 11, summary.get('total_delivered', 0), self.formats['integer'])
-
-            # Escribir columnas de tipos de tareas dinámicamente
-            col_idx = 12
-            for task_type in self.task_types:
-                key = f'{task_type.lower()}_delivered'
-                value = summary.get(key, 0)
-                worksheet.write(row, col_idx, value, self.formats['integer'])
-                col_idx += 1
+            # Total entregadas y columnas de tipos de tareas (dinámicas) en un solo bloque
+            worksheet.write_row(row, 11, [total_delivered] + task_counts, self.formats['integer'])
+            col_idx = 12 + len(task_counts)
 
             # Columnas finales (Mejor/Peor Sprint)
             best_sprint = summary.get('best_sprint', {})
-            worksheet.write(row, col_idx, f"{best_sprint.get('name', 'N/A')} ({best_sprint.get('throughput', 0)})", self.formats['text'])
-            col_idx += 1
-
             worst_sprint = summary.get('worst_sprint', {})
-            worksheet.write(row, col_idx, f"{worst_sprint.get('name', 'N/A')} ({worst_sprint.get('throughput', 0)})", self.formats['text'])
+            worksheet.write_row(row, col_idx, [
+                f"{best_sprint.get('name', 'N/A')} ({best_sprint.get('throughput', 0)})",
+                f"{worst_sprint.get('name', 'N/A')} ({worst_sprint.get('throughput', 0)})",
+            ], self.formats['text'])
 
             row += 1
 
@@ -281,34 +336,25 @@ class BatchReportGenerator:
         # Calcular promedios
         num_teams = len(self.results)
         if num_teams > 0:
-            avg_throughput = sum(r.summary.get('avg_throughput', 0) for r in self.results) / num_teams
-            avg_velocity = sum(r.summary.get('avg_velocity', 0) for r in self.results) / num_teams
-            avg_cycle_time = sum(r.summary.get('avg_cycle_time', 0) for r in self.results) / num_teams
-            avg_pred = sum(r.summary.get('avg_predictability', 0) for r in self.results) / num_teams
-            avg_eff = sum(r.summary.get('avg_efficiency', 0) for r in self.results) / num_teams
-            avg_rework = sum(r.summary.get('avg_rework', 0) for r in self.results) / num_teams
-            total_delivered = sum(r.summary.get('total_delivered', 0) for r in self.results)
-
-            # Calcular totales de cada tipo de tarea dinámicamente
-            task_type_totals = {}
-            for task_type in self.task_types:
-                key = f'{task_type.lower()}_delivered'
-                total = sum(r.summary.get(key, 0) for r in self.results)
-                task_type_totals[task_type] = total
-
-            worksheet.write(row, 4, avg_throughput, self.formats['number'])
-            worksheet.write(row, 5, avg_velocity, self.formats['number'])
-            worksheet.write(row, 6, avg_cycle_time, self.formats['number'])
+            # Matriz equipos x claves: promedios y totales se reducen por columna
+            total_keys = ('total_delivered',) + self._summary_task_keys
+            values = np.array(
+                [[r.summary.get(key, 0) for key in SUMMARY_AVERAGE_KEYS + total_keys] for r in self.results],
+                dtype=np.float64
+            )
+            num_avg = len(SUMMARY_AVERAGE_KEYS)
+            avg_throughput, avg_velocity, avg_cycle_time, avg_pred, avg_eff, avg_rework = (
+                values[:, :num_avg].mean(axis=0).tolist()
+            )
+            totals = values[:, num_avg:].sum(axis=0).tolist()
+
+            worksheet.write_row(row, 4, [avg_throughput, avg_velocity, avg_cycle_time], self.formats['number'])
             worksheet.write(row, 7, avg_pred, self._get_predictability_format(avg_pred))
             worksheet.write(row, 9, avg_eff, self.formats['number'])
             worksheet.write(row, 10, avg_rework, self._get_rework_format(avg_rework))
-            worksheet.write(row, 11, total_delivered, self.formats['integer'])
 
-            # Escribir totales de tipos de tareas dinámicamente
-            col_idx = 12
-            for task_type in self.task_types:
-                worksheet.write(row, col_idx, task_type_totals[task_type], self.formats['integer'])
-                col_idx += 1
+            # Total entregadas y totales de tipos de tareas (dinámicos) en un solo bloque
+            worksheet.write_row(row, 11, totals, self.formats['integer'])
 
     def _create_team_sheet(self, result: TeamResult) -> None:
         """
@@ -322,10 +368,11 @@ class BatchReportGenerator:
         worksheet = self.workbook.add_worksheet(sheet_name)
 
         # Configurar anchos dinámicos
+        # (índices numéricos: funcionan con cualquier cantidad de tipos de tareas)
         num_task_type_cols = len(self.task_types)
-        last_col_letter = chr(ord('Q') + num_task_type_cols)  # Q es la columna base + tipos de tareas (agregamos Retrabajo Vel.)
-        worksheet.set_column('A:A', 15)
-        worksheet.set_column(f'B:{last_col_letter}', 14)
+        last_col = 16 + num_task_type_cols  # 16 (columna Q) es la base + tipos de tareas (agregamos Retrabajo Vel.)
+        worksheet.set_column(0, 0, 15)
+        worksheet.set_column(1, last_col, 14)
 
         row = 0
 
@@ -357,95 +404,79 @@ class BatchReportGenerator:
             worksheet.write(row, 0, 'No hay datos disponibles', self.formats['text'])
             return
 
-        for _, sprint_row in df.iterrows():
-            col = 0
-            worksheet.write(row, col, sprint_row.get('Sprint', ''), self.formats['text'])
-            col += 1
-            worksheet.write(row, col, sprint_row.get('Month', ''), self.formats['text'])
-            col += 1
-            worksheet.write(row, col, sprint_row.get('Throughput', 0), self.formats['integer'])
-            col += 1
-            worksheet.write(row, col, sprint_row.get('Velocity', 0), self.formats['number'])
-            col += 1
-            worksheet.write(row, col, sprint_row.get('Total_Estimated', 0), self.formats['number'])
-            col += 1
-            worksheet.write(row, col, sprint_row.get('Cycle_Time_Avg', 0), self.formats['number'])
-            col += 1
-            worksheet.write(row, col, sprint_row.get('Cycle_Time_Median', 0), self.formats['number'])
-            col += 1
-            worksheet.write(row, col, sprint_row.get('Cycle_Time_HDU_Avg', 0), self.formats['number'])
-            col += 1
-            worksheet.write(row, col, sprint_row.get('Cycle_Time_HDU_Median', 0), self.formats['number'])
-            col += 1
-
-            # Predictibilidad con formato
-            pred = sprint_row.get('Predictability', 0)
-            worksheet.write(row, col, pred, self._get_predictability_format(pred))
-            col += 1
-
-            pred_hdu = sprint_row.get('Predictability_HDU', 0)
-            worksheet.write(row, col, pred_hdu, self._get_predictability_format(pred_hdu))
-            col += 1
-
-            worksheet.write(row, col, sprint_row.get('Efficiency', 0), self.formats['number'])
-            col += 1
-
-            # Retrabajo con formato
-            rework = sprint_row.get('Rework', 0)
-            worksheet.write(row, col, rework, self._get_rework_format(rework))
-            col += 1
-
-            rework_ach = sprint_row.get('Rework_Achieved', 0)
-            worksheet.write(row, col, rework_ach, self._get_rework_format(rework_ach))
-            col += 1
-
-            rework_vel = sprint_row.get('Rework_Velocity', 0)
-            worksheet.write(row, col, rework_vel, self._get_rework_format(rework_vel))
-            col += 1
-
-            worksheet.write(row, col, sprint_row.get('Total_Tasks', 0), self.formats['integer'])
-            col += 1
-            worksheet.write(row, col, sprint_row.get('Delivered_Tasks', 0), self.formats['integer'])
-            col += 1
-
-            # Escribir columnas de tipos de tareas dinámicamente
-            for task_type in self.task_types:
-                key = f'{task_type}_Delivered'
-                value = sprint_row.get(key, 0)
-                worksheet.write(row, col, value, self.formats['integer'])
-                col += 1
+        # Seleccionar las columnas en el orden de escritura, completando las faltantes
+        columns = TEAM_SHEET_COLUMNS + list(self._team_task_keys)
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            df = df.assign(**{col: '' if col in TEAM_SHEET_TEXT_COLUMNS else 0 for col in missing})
+
+        # Formatos y métodos usados en cada fila, resueltos una sola vez
+        fmt_text = self.formats['text']
+        fmt_int = self.formats['integer']
+        fmt_num = self.formats['number']
+        pred_fmt = self._get_predictability_format
+        rework_fmt = self._get_rework_format
+        write = worksheet.write
+        write_row = worksheet.write_row
+
+        # Las celdas consecutivas con el mismo formato se escriben en bloque con write_row
+        for values in df[columns].itertuples(index=False, name=None):
+            write_row(row, 0, values[0:2], fmt_text)
+            write(row, 2, values[2], fmt_int)
+            write_row(row, 3, values[3:9], fmt_num)
+
+            # Predictibilidad y retrabajo con formato condicional
+            pred, pred_hdu, efficiency, rework, rework_ach, rework_vel = values[9:15]
+            write(row, 9, pred, pred_fmt(pred))
+            write(row, 10, pred_hdu, pred_fmt(pred_hdu))
+            write(row, 11, efficiency, fmt_num)
+            write(row, 12, rework, rework_fmt(rework))
+            write(row, 13, rework_ach, rework_fmt(rework_ach))
+            write(row, 14, rework_vel, rework_fmt(rework_vel))
+
+            # Conteos de tareas y columnas de tipos de tareas (dinámicas)
+            write_row(row, 15, values[15:], fmt_int)
 
             row += 1
 
     def _get_predictability_format(self, value: float):
         """Retorna formato según valor de predictibilidad."""
-        if pd.isna(value):
+        if value is None or value != value:  # None o NaN
             return self.formats['number']
-        if value >= THRESHOLDS['predictability_good']:
-            return self.formats['good']
-        elif value >= THRESHOLDS['predictability_warning']:
-            return self.formats['warning']
-        return self.formats['danger']
+        # Tramo: 0 = bajo warning, 1 = entre warning y good, 2 = sobre good
+        bucket = int(value >= _PRED_WARN) + int(value >= _PRED_GOOD)
+        return self._pred_formats[bucket]
 
     def _get_rework_format(self, value: float):
         """Retorna formato según valor de retrabajo (inverso)."""
-        if pd.isna(value):
+        if value is None or value != value:  # None o NaN
             return self.formats['number']
-        if value <= THRESHOLDS['rework_good']:
-            return self.formats['good']
-        elif value <= THRESHOLDS['rework_warning']:
-            return self.formats['warning']
-        return self.formats['danger']
-
-    def _calculate_avg_predictability_hdu(self, sprint_metrics: pd.DataFrame) -> float:
-        """Calcula promedio de predictibilidad HDU."""
-        if sprint_metrics.empty or 'Predictability_HDU' not in sprint_metrics.columns:
-            return 0.0
-        valid_values = sprint_metrics['Predictability_HDU'].dropna()
-        if len(valid_values) == 0:
-            return 0.0
-        return valid_values.mean()
+        # Tramo: 0 = hasta good, 1 = hasta warning, 2 = sobre warning
+        bucket = int(value > _REWORK_GOOD) + int(value > _REWORK_WARN)
+        return self._rework_formats[bucket]
+
+    def _calculate_avg_predictability_hdu(self) -> List[float]:
+        """
+        Calcula el promedio de predictibilidad HDU de cada equipo.
 
+        Las series de todos los equipos se concatenan y se promedian con una
+        sola agrupación. Equipos sin datos de predictibilidad HDU quedan en 0.
+
+        Returns:
+            Lista de promedios en el mismo orden que self.results.
+        """
+        num_teams = len(self.results)
+        parts = {
+            idx: result.sprint_metrics['Predictability_HDU']
+            for idx, result in enumerate(self.results)
+            if 'Predictability_HDU' in result.sprint_metrics.columns
+        }
+        if not parts:
+            return [0.0] * num_teams
+
+        # mean() ignora NaN; equipos sin valores válidos quedan en NaN -> 0
+        means = pd.concat(parts).groupby(level=0).mean()
+        return means.reindex(range(num_teams)).fillna(0.0).tolist()
 
 def generate_batch_report(
     results: List[TeamResult],
@@ -5,7 +5,8 @@ Este módulo contiene todas las constantes, mapeos y umbrales utilizados
 en el análisis de métricas de performance ágil.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
+import numpy as np
 
 
 # Versión del analizador
@@ -151,6 +152,14 @@ OPTIONAL_COLUMNS: List[str] = [
     'Carry over'
 ]
 
+# Columnas que lee load_and_validate_data (el resto del Excel no se parsea):
+# las del pipeline de métricas más 'Asignado' (y su variante con error tipográfico)
+LOADER_COLUMNS: List[str] = REQUIRED_COLUMNS + OPTIONAL_COLUMNS + [
+    'Sprint Completed?',
+    'Asignado',
+    'Asigando',
+]
+
 # Columnas de fecha que pueden usarse como fecha de entrega para Cycle Time - Equipos Productivos
 DELIVERY_DATE_COLUMNS_PRODUCTIVE: List[str] = [
     'Fecha Término',
@@ -167,6 +176,17 @@ DELIVERY_DATE_COLUMNS_DEVELOPMENT: List[str] = [
     'Fecha paso a Producción'
 ]
 
+# Columnas que usan los scripts de predictabilidad (el resto del Excel no se lee)
+PREDICTABILITY_COLUMNS: List[str] = [
+    'Name',
+    'Estado',
+    'Tipo Tarea',
+    'Estimación Original',
+    'Puntos Logrados',
+    'Sprint',
+    'Sprint Completed?',
+]
+
 # Configuración de visualizaciones
 CHART_CONFIG: Dict[str, any] = {
     'dpi': 100,
@@ -247,6 +267,10 @@ HOLIDAYS: List[str] = [
     '2025-12-25',  # Navidad
 ]
 
+# Feriados como fechas NumPy (convertidos una sola vez), listos para
+# np.busday_count / np.is_busday
+HOLIDAYS_NP: np.ndarray = np.array(HOLIDAYS, dtype='datetime64[D]')
+
 # =============================================================================
 # CONFIGURACIÓN PARA PROCESAMIENTO BATCH
 # =============================================================================
@@ -268,4 +292,21 @@ BATCH_CONFIG: Dict[str, any] = {
     'team_name_regex': r'Backlog_Planning_(.+?)_All_Tasks_',
     'output_filename': 'Metricas_Consolidadas_Equipos.xlsx',
     'summary_sheet_name': 'Resumen Comparativo',
+    # Procesos paralelos para procesar equipos (None = según CPUs disponibles, 1 = secuencial)
+    'max_workers': None,
+    # Directorio temporal para escribir el Excel fila a fila (None = el del sistema)
+    'tmpdir': None,
+    # Carpeta para guardar los resultados de cada equipo entre ejecuciones
+    # (None = sin caché). Se invalida si cambia el Excel, el tipo/tamaño del
+    # equipo, el mapeo de sprints, la configuración de cálculo o CACHE_VERSION.
+    'result_cache_dir': None,
 }
+
+# Carpeta para guardar los Excel ya leídos entre ejecuciones (None = sin caché).
+# Debe ser una carpeta propia y no la de los datos de entrada: la caché se
+# carga con pickle, por lo que solo debe poder escribirla el propio usuario.
+EXCEL_CACHE_DIR: Optional[str] = None
+
+# Versión del formato/cálculo de los resultados en caché: incrementarla al
+# modificar el procesamiento o el cálculo de métricas
+CACHE_VERSION: int = 1
@@ -9,27 +9,49 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
-from config import REQUIRED_COLUMNS, OPTIONAL_COLUMNS
+from config import REQUIRED_COLUMNS, OPTIONAL_COLUMNS, LOADER_COLUMNS
+from excel_cache import excel_cache_path, read_excel_cached
 from utils import (
     print_error,
     print_success,
     print_warning,
-    get_completion_stats
+    get_columns_completion_stats,
+    get_excel_engine
 )
 
 
 logger = logging.getLogger(__name__)
 
+# Columnas críticas cuya completitud se muestra en el reporte de validación
+CRITICAL_COLUMNS: List[str] = [
+    'Sprint',
+    'Estado',
+    'Estimación Original',
+    'Puntos Logrados',
+    'Fecha Inicio',
+    'Fecha Ready for Production'
+]
+
 
 class DataLoader:
     """Cargador y validador de datos de Monday.com."""
 
-    def __init__(self, file_path: str):
+    def __init__(
+        self,
+        file_path: str,
+        use_cache: bool = True,
+        columns: Optional[List[str]] = None
+    ):
         """
         Inicializa el cargador de datos.
 
         Args:
             file_path: Ruta al archivo Excel de Monday.com.
+            use_cache: Si es True y EXCEL_CACHE_DIR está configurado, guarda
+                el Excel leído en esa carpeta y lo reutiliza mientras el
+                Excel no cambie.
+            columns: Columnas a leer del Excel. Si es None se leen todas; si
+                se indica, el resto de las columnas no se parsea.
 
         Raises:
             FileNotFoundError: Si el archivo no existe.
@@ -38,8 +60,16 @@ class DataLoader:
         if not self.file_path.exists():
             raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
 
+        self.use_cache = use_cache
+        self.columns = columns
         self.df: Optional[pd.DataFrame] = None
         self.validation_results: Dict[str, any] = {}
+        # DataFrame y resultado de la última validación (se reutiliza si no cambió)
+        self._validated_df: Optional[pd.DataFrame] = None
+        self._validation_outcome: Tuple[bool, List[str]] = (False, [])
+        # Completitud de las columnas críticas (se calcula una vez por DataFrame)
+        self._completion_df: Optional[pd.DataFrame] = None
+        self._completion_stats: Dict[str, Dict[str, any]] = {}
 
     def load(self) -> pd.DataFrame:
         """
@@ -56,7 +86,21 @@ class DataLoader:
 
             # Leer el archivo Excel
             # La fila 0 tiene el título del board, fila 1 es "All Tasks", fila 2 tiene los headers
-            df = pd.read_excel(self.file_path, header=2)
+            cache_path = excel_cache_path(self.file_path, '.loader.pkl') if self.use_cache else None
+            if cache_path is not None:
+                df = read_excel_cached(
+                    self.file_path,
+                    cache_path,
+                    columns=self.columns,
+                    header=2,
+                    engine=get_excel_engine()
+                )
+            else:
+                usecols = None
+                if self.columns is not None:
+                    wanted = set(self.columns)
+                    usecols = lambda name: name in wanted
+                df = pd.read_excel(self.file_path, header=2, usecols=usecols, engine=get_excel_engine())
 
             # Verificar que hay datos
             if df.empty:
@@ -134,7 +178,13 @@ class DataLoader:
         if self.df is None:
             return False, ["No hay datos cargados. Ejecute load() primero."]
 
+        # Si el DataFrame es el mismo ya validado, reutilizar el resultado
+        if self._validated_df is self.df:
+            is_valid, errors = self._validation_outcome
+            return is_valid, list(errors)
+
         errors = []
+        total_rows = len(self.df)
 
         # Validar columnas requeridas
         missing_columns = self._validate_columns()
@@ -142,7 +192,7 @@ class DataLoader:
             errors.append(f"Columnas faltantes: {', '.join(missing_columns)}")
 
         # Validar que hay al menos una fila de datos
-        if len(self.df) == 0:
+        if total_rows == 0:
             errors.append("No hay filas de datos en el archivo")
 
         # Validar tipos de datos básicos
@@ -151,7 +201,7 @@ class DataLoader:
 
         # Guardar resultados de validación
         self.validation_results = {
-            'total_rows': len(self.df),
+            'total_rows': total_rows,
             'missing_columns': missing_columns,
             'data_errors': data_errors,
             'is_valid': len(errors) == 0
@@ -164,6 +214,9 @@ class DataLoader:
         else:
             logger.warning(f"Validación falló con {len(errors)} errores")
 
+        self._validated_df = self.df
+        self._validation_outcome = (is_valid, list(errors))
+
         return is_valid, errors
 
     def _validate_columns(self) -> List[str]:
@@ -173,15 +226,14 @@ class DataLoader:
         Returns:
             Lista de columnas faltantes.
         """
-        current_columns = set(self.df.columns)
-        required_columns = set(REQUIRED_COLUMNS)
-
-        missing = required_columns - current_columns
+        # Búsqueda directa en el índice de columnas (en el orden de REQUIRED_COLUMNS)
+        columns = self.df.columns
+        missing = [col for col in REQUIRED_COLUMNS if col not in columns]
 
         if missing:
             logger.warning(f"Columnas faltantes: {missing}")
 
-        return list(missing)
+        return missing
 
     def _validate_data_types(self) -> List[str]:
         """
@@ -193,8 +245,9 @@ class DataLoader:
         errors = []
 
         # Validar que hay sprints
-        if 'Sprint' in self.df.columns:
-            valid_sprints = self.df['Sprint'].notna().sum()
+        completion_stats = self._get_completion_stats()
+        if 'Sprint' in completion_stats:
+            valid_sprints = completion_stats['Sprint']['complete']
             if valid_sprints == 0:
                 errors.append("No hay sprints válidos en los datos")
         else:
@@ -232,21 +285,10 @@ class DataLoader:
         # Estadísticas de completitud
         if self.df is not None:
             print("\nCompletitud de datos críticos:")
-            critical_columns = [
-                'Sprint',
-                'Estado',
-                'Estimación Original',
-                'Puntos Logrados',
-                'Fecha Inicio',
-                'Fecha Ready for Production'
-            ]
-
-            for col in critical_columns:
-                if col in self.df.columns:
-                    stats = get_completion_stats(self.df, col)
-                    percentage = stats['percentage']
-                    symbol = '✓' if percentage > 80 else '⚠' if percentage > 50 else '✗'
-                    print(f"  {symbol} {col}: {stats['complete']}/{stats['total']} ({percentage:.1f}%)")
+            for col, stats in self._get_completion_stats().items():
+                percentage = stats['percentage']
+                symbol = '✓' if percentage > 80 else '⚠' if percentage > 50 else '✗'
+                print(f"  {symbol} {col}: {stats['complete']}/{stats['total']} ({percentage:.1f}%)")
 
         # Estado final
         is_valid = self.validation_results.get('is_valid', False)
@@ -256,10 +298,31 @@ class DataLoader:
         else:
             print_error("Validación fallida - Corrija los errores antes de continuar")
 
-    def get_dataframe(self) -> pd.DataFrame:
+    def _get_completion_stats(self) -> Dict[str, Dict[str, any]]:
+        """
+        Obtiene la completitud de las columnas críticas del DataFrame cargado.
+
+        Los valores no nulos se cuentan en una sola pasada y el resultado se
+        reutiliza (validate() y print_validation_report()) mientras el
+        DataFrame no cambie.
+
+        Returns:
+            Diccionario columna -> estadísticas (ver get_columns_completion_stats).
+        """
+        if self._completion_df is not self.df:
+            self._completion_stats = get_columns_completion_stats(self.df, CRITICAL_COLUMNS)
+            self._completion_df = self.df
+
+        return self._completion_stats
+
+    def get_dataframe(self, copy: bool = False) -> pd.DataFrame:
         """
         Obtiene el DataFrame cargado.
 
+        Args:
+            copy: Si es True, retorna una copia que se puede modificar sin
+                afectar al cargador.
+
         Returns:
             DataFrame con los datos.
 
@@ -269,7 +332,7 @@ class DataLoader:
         if self.df is None:
             raise ValueError("No hay datos cargados. Ejecute load() primero.")
 
-        return self.df.copy()
+        return self.df.copy() if copy else self.df
 
 
 def load_and_validate_data(file_path: str, verbose: bool = False) -> pd.DataFrame:
@@ -286,7 +349,8 @@ def load_and_validate_data(file_path: str, verbose: bool = False) -> pd.DataFram
     Raises:
         ValueError: Si la validación falla.
     """
-    loader = DataLoader(file_path)
+    # Solo se leen las columnas que usa el pipeline de métricas
+    loader = DataLoader(file_path, columns=LOADER_COLUMNS)
 
     # Cargar datos
     loader.load()
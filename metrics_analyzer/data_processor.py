@@ -6,22 +6,27 @@ para el cálculo de métricas.
 """
 
 import logging
+import re
 from typing import Dict, List, Literal
 import pandas as pd
 import numpy as np
+from pandas.api.types import is_bool_dtype, is_datetime64_dtype, is_numeric_dtype
 from config import (
     DELIVERY_STATES_PRODUCTIVE,
     DELIVERY_STATES_DEVELOPMENT,
-    DEFAULT_SPRINT_MAPPING
+    DEFAULT_SPRINT_MAPPING,
+    HOLIDAYS_NP,
+    COPY_SUFFIXES
 )
 from utils import (
-    is_copied_task,
     safe_float_conversion,
     safe_date_conversion,
     is_sprint_completed,
     print_warning,
     print_info,
-    calculate_business_days,
+    to_datetime64_days,
+    apply_unique,
+    strip_text_column,
     extract_sprint_number,
     normalize_task_type,
     calculate_sprint_end_date
@@ -30,6 +35,9 @@ from utils import (
 
 logger = logging.getLogger(__name__)
 
+# Patrón para detectar tareas copiadas (cualquiera de los sufijos, sensible a mayúsculas)
+_COPY_SUFFIX_PATTERN = '|'.join(re.escape(suffix) for suffix in COPY_SUFFIXES)
+
 
 class DataProcessor:
     """Procesador de datos de Monday.com."""
@@ -50,8 +58,10 @@ class DataProcessor:
             sprint_mapping: Mapeo de sprints a meses. Si es None, usa el por defecto.
             delivery_date_column: Columna de fecha a usar como fecha de entrega para Cycle Time.
         """
-        self.raw_df = df.copy()
-        self.df = df.copy()
+        # El DataFrame de entrada no se copia ni se modifica: el primer paso del
+        # procesamiento (dropna) ya genera un DataFrame nuevo sobre el que se trabaja
+        self.raw_df = df
+        self.df = df
         self.team_type = team_type
         self.sprint_mapping = sprint_mapping or DEFAULT_SPRINT_MAPPING
         self.delivery_date_column = delivery_date_column
@@ -100,26 +110,31 @@ class DataProcessor:
         # Eliminar filas completamente vacías
         self.df = self.df.dropna(how='all')
 
-        # Limpiar espacios en columnas de texto
+        # Limpiar espacios en columnas de texto (las celdas vacías quedan nulas)
         text_columns = ['Name', 'Estado', 'Sprint', 'Tipo Tarea']
         for col in text_columns:
             if col in self.df.columns:
-                self.df[col] = self.df[col].astype(str).str.strip()
+                self.df[col] = strip_text_column(self.df[col])
 
         # Normalizar tipos de tareas (HdU -> HDU, bug -> Bug, etc.)
         if 'Tipo Tarea' in self.df.columns:
-            self.df['Tipo Tarea'] = self.df['Tipo Tarea'].apply(normalize_task_type)
+            self.df['Tipo Tarea'] = apply_unique(self.df['Tipo Tarea'], normalize_task_type)
             logger.debug("Tipos de tareas normalizados según configuración")
 
     def _convert_data_types(self) -> None:
         """Convierte columnas a los tipos de datos apropiados."""
         logger.debug("Convirtiendo tipos de datos...")
 
-        # Convertir columnas numéricas
+        # Convertir columnas numéricas (las que ya vienen numéricas del Excel
+        # solo se pasan a float; el resto se convierte una vez por valor distinto)
         numeric_columns = ['Estimación Original', 'Puntos Logrados', 'Ciclos UAT']
         for col in numeric_columns:
             if col in self.df.columns:
-                self.df[col] = self.df[col].apply(safe_float_conversion)
+                values = self.df[col]
+                if is_numeric_dtype(values) and not is_bool_dtype(values):
+                    self.df[col] = values.astype('float64')
+                else:
+                    self.df[col] = apply_unique(values, safe_float_conversion)
 
         # Convertir columnas de fecha
         date_columns = [
@@ -129,158 +144,168 @@ class DataProcessor:
             'Fecha paso a Producción'
         ]
         for col in date_columns:
-            if col in self.df.columns:
-                self.df[col] = self.df[col].apply(safe_date_conversion)
+            # Las columnas que el lector de Excel ya entregó como fechas se
+            # mantienen (safe_date_conversion las dejaría igual)
+            if col in self.df.columns and not is_datetime64_dtype(self.df[col]):
+                self.df[col] = apply_unique(self.df[col], safe_date_conversion)
 
     def _add_calculated_columns(self) -> None:
         """Agrega columnas calculadas."""
         logger.debug("Agregando columnas calculadas...")
 
+        df = self.df
+
         # Es tarea copiada?
-        self.df['Is_Copy'] = self.df['Name'].apply(is_copied_task)
+        is_copy = df['Name'].str.contains(_COPY_SUFFIX_PATTERN, regex=True, na=False)
 
-        # Sprint está completado?
-        if 'Sprint Completed?' in self.df.columns:
-            self.df['Sprint_Completed'] = self.df['Sprint Completed?'].apply(is_sprint_completed)
+        # Sprint está completado? (las columnas de texto tienen pocos valores
+        # distintos, así que las funciones escalares se evalúan una vez por valor)
+        if 'Sprint Completed?' in df.columns:
+            sprint_completed = apply_unique(df['Sprint Completed?'], is_sprint_completed).astype(bool)
         else:
-            self.df['Sprint_Completed'] = False
+            sprint_completed = False
 
         # Extraer número unificado de sprint (para agrupar sprints con mismo número)
-        self.df['Sprint_Unified'] = self.df['Sprint'].apply(extract_sprint_number)
+        sprint_unified = apply_unique(df['Sprint'], extract_sprint_number)
+
+        # Estado tiene pocos valores distintos: se usa una vista categórica local
+        # para que las comparaciones por estado operen sobre códigos enteros
+        # (la columna del DataFrame no cambia de tipo)
+        estado = df['Estado'].astype('category')
 
         # Es tarea entregada?
-        self.df['Is_Delivered'] = self.df['Estado'].isin(self.delivery_states)
+        is_delivered = estado.isin(self.delivery_states).to_numpy()
 
-        # Tiene carry over?
-        if 'Carry over' in self.df.columns:
-            self.df['Has_Carry_Over'] = self.df['Carry over'].apply(
-                lambda x: str(x).strip().lower() == 'v' if pd.notna(x) else False
-            )
+        # Tiene carry over? (las celdas vacías quedan nulas y eq() las marca como False)
+        if 'Carry over' in df.columns:
+            has_carry_over = strip_text_column(df['Carry over']).str.lower().eq('v')
         else:
-            self.df['Has_Carry_Over'] = False
-
-        # Cycle Time en días
-        self.df['Cycle_Time_Days'] = self.df.apply(
-            lambda row: self._calculate_cycle_time(row),
-            axis=1
-        )
-
-        # Puntos efectivos (Puntos Logrados si existe, sino Estimación Original)
-        self.df['Effective_Points'] = self.df.apply(
-            lambda row: self._get_effective_points(row),
-            axis=1
-        )
+            has_carry_over = False
 
         # Es bug?
-        if 'Tipo Tarea' in self.df.columns:
-            self.df['Is_Bug'] = self.df['Tipo Tarea'].str.lower().str.contains('bug', na=False)
+        if 'Tipo Tarea' in df.columns:
+            is_bug = df['Tipo Tarea'].str.contains('bug', case=False, regex=False, na=False)
         else:
-            self.df['Is_Bug'] = False
+            is_bug = False
+
+        # Todas las columnas se agregan de una vez (en el mismo orden de siempre)
+        self.df = df.assign(
+            Is_Copy=is_copy,
+            Sprint_Completed=sprint_completed,
+            Sprint_Unified=sprint_unified,
+            Is_Delivered=is_delivered,
+            Has_Carry_Over=has_carry_over,
+            # Cycle Time en días hábiles
+            Cycle_Time_Days=self._calculate_cycle_time(estado, is_delivered),
+            # Puntos efectivos (Puntos Logrados si existe, sino Estimación Original)
+            Effective_Points=self._get_effective_points(),
+            Is_Bug=is_bug
+        )
 
-    def _calculate_cycle_time(self, row: pd.Series) -> float:
+    def _calculate_cycle_time(self, estado: pd.Series, is_delivered: np.ndarray) -> np.ndarray:
         """
-        Calcula el cycle time para una tarea en días hábiles.
+        Calcula el cycle time de todas las tareas en días hábiles.
 
         Solo calcula para tareas en estado DoD.
 
-        Lógica de fecha de finalización:
-        - Estados 11, 12, 13: Fecha Ready for Production, o fecha fin de sprint si no existe
-        - Estado 9: Fecha Certificado QA, o Fecha Término, o fecha fin de sprint si no existe
+        Lógica de fecha de finalización (primera fecha disponible):
+        - Estados 11, 12, 13: Fecha Ready for Production, fecha fin de sprint, Fecha Término
+        - Estado 9: Fecha Certificado QA, Fecha Término, fecha fin de sprint, Fecha Ready for Production
+        - Estado 10 (UAT): Fecha UAT, Fecha Término, fecha fin de sprint, Fecha Ready for Production
+        - Otros: Fecha Ready for Production, Fecha Término, fecha fin de sprint
 
         Args:
-            row: Fila del DataFrame.
+            estado: Estado de cada tarea (idealmente de tipo 'category').
+            is_delivered: Array booleano con las tareas en estado DoD.
 
         Returns:
-            Cycle time en días hábiles, o NaN si no es posible calcular.
-        """
-        # Solo calcular para tareas en DoD
-        if not row.get('Is_Delivered', False):
-            return np.nan
-
-        start = row.get('Fecha Inicio')
-        estado = row.get('Estado', '')
-        sprint = row.get('Sprint', '')
-
-        # Determinar fecha de finalización según el estado
-        end = None
-
-        # Para estados 11, 12, 13 (Ready for Product Release, Validación a Producción, Producción)
-        if estado in ['11. Ready for Product Release', '12. Validación a Producción', '13. Producción']:
-            # Prioridad 1: Fecha Ready for Production
-            end = row.get('Fecha Ready for Production')
-
-            # Prioridad 2: Si no existe, usar fecha fin de sprint
-            if pd.isna(end):
-                end = calculate_sprint_end_date(sprint)
-
-        # Para estado 9 (Certificado QA)
-        elif estado == '9. Certificado QA':
-            # Prioridad 1: Fecha Certificado QA
-            end = row.get('Fecha Certificado QA')
-
-            # Prioridad 2: Fecha Término
-            if pd.isna(end):
-                end = row.get('Fecha Término')
-
-            # Prioridad 3: Fecha fin de sprint
-            if pd.isna(end):
-                end = calculate_sprint_end_date(sprint)
-
-        # Para estado 10 (UAT) - agregar por si acaso
-        elif estado == '10. UAT':
-            # Prioridad 1: Fecha UAT
-            end = row.get('Fecha UAT')
-
-            # Prioridad 2: Fecha Término
-            if pd.isna(end):
-                end = row.get('Fecha Término')
-
-            # Prioridad 3: Fecha fin de sprint
-            if pd.isna(end):
-                end = calculate_sprint_end_date(sprint)
-
-        # Si aún no tenemos fecha final, intentar con las columnas genéricas
-        if pd.isna(end):
-            end = row.get('Fecha Ready for Production')
-            if pd.isna(end):
-                end = row.get('Fecha Término')
-            if pd.isna(end):
-                end = calculate_sprint_end_date(sprint)
-
-        if pd.isna(start) or pd.isna(end):
-            return np.nan
-
-        try:
-            # Calcular días hábiles en lugar de días calendario
-            business_days = calculate_business_days(start, end)
-            return business_days if business_days is not None else np.nan
-        except:
-            return np.nan
-
-    def _get_effective_points(self, row: pd.Series) -> float:
+            Array con el cycle time en días hábiles (inicio y fin inclusive),
+            o NaN si no es posible calcular.
         """
-        Obtiene los puntos efectivos para una tarea.
+        df = self.df
+        n_rows = len(df)
+
+        def column(name: str) -> np.ndarray:
+            if name in df.columns:
+                return df[name].to_numpy(dtype=object)
+            return np.full(n_rows, None, dtype=object)
+
+        # Fecha fin de sprint: se calcula una vez por sprint distinto
+        sprint_codes, sprints = pd.factorize(column('Sprint'))
+        sprint_end = np.array(
+            [calculate_sprint_end_date(sprint) for sprint in sprints] + [None],
+            dtype=object
+        )[sprint_codes]
+
+        ready = column('Fecha Ready for Production')
+        termino = column('Fecha Término')
+        end_chains = [
+            (
+                estado.isin([
+                    '11. Ready for Product Release',
+                    '12. Validación a Producción',
+                    '13. Producción',
+                ]).to_numpy(),
+                [ready, sprint_end, termino]
+            ),
+            (
+                (estado == '9. Certificado QA').to_numpy(),
+                [column('Fecha Certificado QA'), termino, sprint_end, ready]
+            ),
+            (
+                (estado == '10. UAT').to_numpy(),
+                [column('Fecha UAT'), termino, sprint_end, ready]
+            ),
+        ]
+        other_states = ~np.logical_or.reduce([mask for mask, _ in end_chains])
+        end_chains.append((other_states, [ready, termino, sprint_end]))
+
+        # Primera fecha no nula según la prioridad del estado de cada tarea
+        end = np.full(n_rows, None, dtype=object)
+        for mask, candidates in end_chains:
+            for candidate in candidates:
+                take = mask & pd.notna(candidate)
+                end[take] = candidate[take]
+                mask = mask & ~take
+
+        start_days = to_datetime64_days(column('Fecha Inicio'))
+        end_days = to_datetime64_days(end)
+
+        valid = (
+            is_delivered
+            & ~np.isnat(start_days)
+            & ~np.isnat(end_days)
+        )
 
-        Prioridad: Puntos Logrados > Estimación Original
+        cycle_time = np.full(n_rows, np.nan)
+        business_days = np.busday_count(
+            start_days[valid],
+            end_days[valid] + np.timedelta64(1, 'D'),
+            holidays=HOLIDAYS_NP
+        )
+        cycle_time[valid] = np.maximum(business_days, 0)
 
-        Args:
-            row: Fila del DataFrame.
+        return cycle_time
 
-        Returns:
-            Puntos efectivos.
+    def _get_effective_points(self) -> pd.Series:
         """
-        puntos_logrados = row.get('Puntos Logrados')
-        estimacion_original = row.get('Estimación Original')
+        Obtiene los puntos efectivos de todas las tareas.
+
+        Prioridad: Puntos Logrados (si es mayor a 0) > Estimación Original > 0.
 
-        # Si hay Puntos Logrados, usar esos
-        if pd.notna(puntos_logrados) and puntos_logrados > 0:
-            return puntos_logrados
+        Returns:
+            Serie con los puntos efectivos.
+        """
+        def points(name: str) -> pd.Series:
+            if name in self.df.columns:
+                return self.df[name].astype('float64')
+            return pd.Series(np.nan, index=self.df.index)
 
-        # Si no, usar Estimación Original
-        if pd.notna(estimacion_original):
-            return estimacion_original
+        puntos_logrados = points('Puntos Logrados')
+        estimacion_original = points('Estimación Original')
 
-        return 0.0
+        # Puntos Logrados si existen y son positivos; si no, Estimación Original
+        return puntos_logrados.where(puntos_logrados > 0, estimacion_original.fillna(0.0))
 
     def _filter_invalid_data(self) -> None:
         """Filtra datos no válidos para el análisis."""
@@ -288,13 +313,15 @@ class DataProcessor:
 
         initial_count = len(self.df)
 
-        # Filtrar tareas con sprint válido
-        self.df = self.df[self.df['Sprint'].notna() & (self.df['Sprint'] != 'nan')]
+        # Las condiciones se combinan en una sola máscara y el DataFrame se filtra una vez
+        # Tareas con sprint válido
+        keep = self.df['Sprint'].notna() & (self.df['Sprint'] != 'nan')
 
         # Para equipos En Desarrollo: filtrar tareas en estado 9 con 0 puntos estimados
         # Estas son tareas que Monday no permite cerrar y se arrastran con 0 puntos
         if self.team_type == 'En Desarrollo':
             estado_9_zero_points = (
+                keep &
                 (self.df['Estado'] == '9. Certificado QA') &
                 (self.df['Estimación Original'] == 0)
             )
@@ -306,7 +333,9 @@ class DataProcessor:
                     f"(equipos En Desarrollo)"
                 )
 
-            self.df = self.df[~estado_9_zero_points]
+            keep &= ~estado_9_zero_points
+
+        self.df = self.df[keep]
 
         filtered_count = initial_count - len(self.df)
         if filtered_count > 0:
@@ -338,7 +367,8 @@ class DataProcessor:
 
             return None
 
-        self.df['Month'] = self.df['Sprint'].apply(map_sprint_to_month)
+        # Hay pocos sprints distintos: el mapeo se resuelve una vez por sprint
+        self.df['Month'] = apply_unique(self.df['Sprint'], map_sprint_to_month)
 
         # Verificar sprints sin mapeo
         unmapped_sprints = self.df[self.df['Month'].isna()]['Sprint'].unique()
@@ -346,14 +376,18 @@ class DataProcessor:
             logger.warning(f"Sprints sin mapeo a mes: {unmapped_sprints}")
             print_warning(f"Sprints sin mapeo a mes: {', '.join(unmapped_sprints)}")
 
-    def get_processed_data(self) -> pd.DataFrame:
+    def get_processed_data(self, copy: bool = False) -> pd.DataFrame:
         """
         Obtiene el DataFrame procesado.
 
+        Args:
+            copy: Si es True, retorna una copia que se puede modificar sin
+                afectar al procesador.
+
         Returns:
             DataFrame procesado.
         """
-        return self.df.copy()
+        return self.df.copy() if copy else self.df
 
     def get_summary_stats(self) -> Dict[str, any]:
         """
@@ -364,16 +398,16 @@ class DataProcessor:
         """
         total_tasks = len(self.df)
         completed_sprints = self.df['Sprint'].nunique()
-        delivered_tasks = self.df['Is_Delivered'].sum()
-        copied_tasks = self.df['Is_Copy'].sum()
-        tasks_with_carry_over = self.df['Has_Carry_Over'].sum()
+
+        # Conteo de las tres banderas en una sola reducción
+        flag_counts = self.df[['Is_Delivered', 'Is_Copy', 'Has_Carry_Over']].sum()
 
         return {
             'total_tasks': total_tasks,
             'completed_sprints': completed_sprints,
-            'delivered_tasks': int(delivered_tasks),
-            'copied_tasks': int(copied_tasks),
-            'tasks_with_carry_over': int(tasks_with_carry_over),
+            'delivered_tasks': int(flag_counts['Is_Delivered']),
+            'copied_tasks': int(flag_counts['Is_Copy']),
+            'tasks_with_carry_over': int(flag_counts['Has_Carry_Over']),
             'team_type': self.team_type,
             'delivery_states': self.delivery_states
         }
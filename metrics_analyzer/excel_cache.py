@@ -0,0 +1,332 @@
+"""
+Lectura con caché de archivos Excel de Monday.com.
+
+Este módulo centraliza la lectura del Excel crudo que usan los scripts de
+análisis y, si EXCEL_CACHE_DIR está configurado, guarda el DataFrame
+resultante en esa carpeta, de modo que las ejecuciones posteriores sobre el
+mismo archivo no vuelvan a parsear el Excel.
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import pandas as pd
+from config import EXCEL_CACHE_DIR
+from utils import dedup_column_names, extract_sprint_number_value, get_excel_engine
+
+
+logger = logging.getLogger(__name__)
+
+# Columnas numéricas que los scripts de análisis convierten después de la lectura
+NUMERIC_COLUMNS: List[str] = ['Estimación Original', 'Puntos Logrados']
+
+# Columnas con pocos valores distintos que se convierten a 'category'
+CATEGORICAL_COLUMNS: List[str] = ['Sprint', 'Estado', 'Tipo Tarea', 'Sprint Completed?']
+
+
+def load_monday_excel(
+    file_path: str,
+    coerce_numeric: bool = True,
+    as_category: bool = True,
+    columns: Optional[List[str]] = None,
+    use_cache: bool = True
+) -> pd.DataFrame:
+    """
+    Carga un Excel de Monday.com reutilizando una caché en disco.
+
+    La caché solo se usa si EXCEL_CACHE_DIR está configurado. Se reutiliza
+    mientras sea más reciente que el Excel, haya sido generada con la misma
+    versión de pandas y el mismo motor de lectura, y contenga las columnas
+    solicitadas.
+
+    Args:
+        file_path: Ruta al archivo Excel.
+        coerce_numeric: Si es True, convierte NUMERIC_COLUMNS a numérico
+            (valores inválidos quedan como NaN).
+        as_category: Si es True, convierte CATEGORICAL_COLUMNS a 'category'
+            para que filtros y agrupaciones operen sobre códigos enteros.
+            'Sprint' queda como categoría ordenada por número de sprint.
+            Las agrupaciones sobre estas columnas deben usar observed=True.
+        columns: Columnas a leer. Si es None se leen todas; si se indica,
+            el resto de las columnas del Excel no se parsea.
+        use_cache: Si es False, no se lee ni se guarda la caché aunque
+            EXCEL_CACHE_DIR esté configurado.
+
+    Returns:
+        DataFrame con los nombres de columna corregidos.
+    """
+    path = Path(file_path)
+    cache_path = excel_cache_path(path, '.pkl') if use_cache else None
+    read_signature = _read_signature(None, {'header': 1, 'engine': get_excel_engine()})
+
+    df = None
+    if cache_path is not None:
+        df = _read_cache(cache_path, path, columns, read_signature)
+    if df is None:
+        df = _read_monday_excel(path, columns)
+        if cache_path is not None:
+            _write_cache(df, cache_path, {
+                'read_signature': read_signature,
+                'columns_subset': columns is not None,
+            })
+    elif columns is not None:
+        wanted = set(columns)
+        df = df[[col for col in df.columns if col in wanted]]
+
+    if coerce_numeric:
+        for col in NUMERIC_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    if as_category:
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+
+        if 'Sprint' in df.columns:
+            # Orden natural por número de sprint (sprints sin número primero)
+            sprints = sorted(df['Sprint'].dropna().unique(), key=_sprint_sort_key)
+            df['Sprint'] = df['Sprint'].astype(pd.CategoricalDtype(categories=sprints, ordered=True))
+
+    return df
+
+
+def read_excel_cached(
+    file_path: str,
+    cache_path: str,
+    columns: Optional[List[str]] = None,
+    **read_kwargs
+) -> pd.DataFrame:
+    """
+    Lee un Excel con pd.read_excel reutilizando una caché en disco.
+
+    La caché se reutiliza mientras sea más reciente que el Excel y haya sido
+    generada con los mismos argumentos de lectura y la misma versión de pandas.
+
+    Args:
+        file_path: Ruta al archivo Excel.
+        cache_path: Ruta del archivo de caché (pickle).
+        columns: Columnas a leer. Si es None se leen todas; si se indica, el
+            resto de las columnas no se parsea (las que no existan en el
+            Excel se ignoran).
+        **read_kwargs: Argumentos para pd.read_excel (header, engine, etc.).
+
+    Returns:
+        DataFrame leído del Excel o de la caché.
+    """
+    path = Path(file_path)
+    cache_path = Path(cache_path)
+    read_signature = _read_signature(columns, read_kwargs)
+
+    if cache_path.exists() and cache_path.stat().st_mtime >= path.stat().st_mtime:
+        df = _load_pickle(cache_path)
+        # La firma solo se usa para validar la caché (no se propaga al resultado)
+        if df is not None and df.attrs.pop('read_signature', None) == read_signature:
+            logger.info(f"Usando caché: {cache_path}")
+            return df
+
+    if columns is not None:
+        wanted = set(columns)
+        read_kwargs['usecols'] = lambda name: name in wanted
+
+    df = pd.read_excel(path, **read_kwargs)
+    _write_cache(df, cache_path, {'read_signature': read_signature})
+
+    return df
+
+
+def excel_cache_path(file_path: str, suffix: str) -> Optional[Path]:
+    """
+    Obtiene la ruta de la caché de un Excel dentro de EXCEL_CACHE_DIR.
+
+    El nombre incluye un hash de la ruta completa del Excel para que archivos
+    con el mismo nombre en distintas carpetas no compartan caché.
+
+    Args:
+        file_path: Ruta al archivo Excel.
+        suffix: Extensión del archivo de caché (ej: '.pkl').
+
+    Returns:
+        Ruta del archivo de caché o None si la caché está desactivada.
+    """
+    if not EXCEL_CACHE_DIR:
+        return None
+
+    path = Path(file_path).resolve()
+    path_hash = hashlib.sha256(str(path).encode('utf-8')).hexdigest()[:16]
+    return Path(EXCEL_CACHE_DIR) / f"{path.stem}_{path_hash}{suffix}"
+
+
+def _read_signature(columns: Optional[List[str]], read_kwargs: Dict[str, Any]) -> str:
+    """
+    Construye la firma de una lectura para validar la caché.
+
+    Los tipos de datos leídos dependen de la versión de pandas, por lo que
+    también forma parte de la firma.
+
+    Args:
+        columns: Columnas leídas (None = todas).
+        read_kwargs: Argumentos de pd.read_excel.
+
+    Returns:
+        Texto que identifica la lectura.
+    """
+    return repr((
+        pd.__version__,
+        sorted(read_kwargs.items()),
+        sorted(columns) if columns is not None else None
+    ))
+
+
+def _write_cache(df: pd.DataFrame, cache_path: Path, attrs: Dict[str, Any]) -> None:
+    """
+    Guarda un DataFrame en la caché junto con sus datos de validación.
+
+    Los datos de validación solo se guardan en el archivo de caché: no quedan
+    en los attrs del DataFrame que recibe el llamador.
+
+    Args:
+        df: DataFrame a guardar.
+        cache_path: Ruta del archivo de caché.
+        attrs: Datos de validación de la caché (firma de lectura, etc.).
+    """
+    df.attrs.update(attrs)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_pickle(cache_path)
+    except OSError as e:
+        logger.warning(f"No se pudo guardar la caché {cache_path}: {e}")
+    finally:
+        for key in attrs:
+            df.attrs.pop(key, None)
+
+
+def _read_cache(
+    cache_path: Path,
+    path: Path,
+    columns: Optional[List[str]],
+    read_signature: str
+) -> Optional[pd.DataFrame]:
+    """
+    Lee la caché si está vigente y contiene las columnas solicitadas.
+
+    Args:
+        cache_path: Ruta al archivo de caché.
+        path: Ruta al archivo Excel original.
+        columns: Columnas solicitadas (None = todas).
+        read_signature: Firma de la lectura actual.
+
+    Returns:
+        DataFrame cacheado, o None si la caché no existe, está desactualizada,
+        fue generada con otra lectura o no contiene las columnas solicitadas.
+    """
+    if not cache_path.exists() or cache_path.stat().st_mtime < path.stat().st_mtime:
+        return None
+
+    df = _load_pickle(cache_path)
+    if df is None:
+        return None
+
+    # Los datos de validación no se propagan al resultado
+    columns_subset = df.attrs.pop('columns_subset', False)
+    if df.attrs.pop('read_signature', None) != read_signature:
+        return None
+
+    if columns_subset:
+        # La caché solo tiene algunas columnas: sirve si incluye las solicitadas
+        if columns is None or not set(columns).issubset(df.columns):
+            return None
+
+    logger.info(f"Usando caché: {cache_path}")
+    return df
+
+
+def _load_pickle(cache_path: Path) -> Optional[pd.DataFrame]:
+    """
+    Lee un archivo de caché, tratando una caché ilegible como inexistente.
+
+    Una caché puede quedar ilegible si fue escrita por otra versión de pandas
+    o si el archivo quedó truncado.
+
+    Args:
+        cache_path: Ruta al archivo de caché.
+
+    Returns:
+        DataFrame cacheado, o None si no se pudo leer.
+    """
+    try:
+        df = pd.read_pickle(cache_path)
+    except Exception as e:
+        logger.warning(f"No se pudo leer la caché {cache_path}, se volverá a leer el Excel: {e}")
+        return None
+
+    if not isinstance(df, pd.DataFrame):
+        logger.warning(f"La caché {cache_path} no contiene un DataFrame, se volverá a leer el Excel")
+        return None
+
+    return df
+
+
+def _sprint_sort_key(sprint_name) -> int:
+    """
+    Clave de orden de un sprint según su número.
+
+    Args:
+        sprint_name: Nombre del sprint.
+
+    Returns:
+        Número del sprint, o 0 si no tiene número.
+    """
+    number = extract_sprint_number_value(sprint_name)
+    return number if number is not None else 0
+
+
+def _read_monday_excel(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Lee el Excel crudo y corrige los nombres de columna.
+
+    En este formato la fila 1 contiene "All Tasks" y la siguiente fila
+    contiene los nombres reales de las columnas.
+
+    Con columns se obtiene lo mismo que leyendo todo y seleccionando esas
+    columnas (incluidos los sufijos de columnas duplicadas, ej: 'Fecha_1').
+
+    Args:
+        path: Ruta al archivo Excel.
+        columns: Columnas a leer (None = todas).
+
+    Returns:
+        DataFrame con los datos y columnas corregidas.
+    """
+    if columns is not None:
+        # Leer solo la fila de headers para ubicar las columnas por posición
+        header_row = pd.read_excel(path, header=None, skiprows=2, nrows=1, engine=get_excel_engine())
+        all_columns = dedup_column_names(header_row.iloc[0].tolist())
+        wanted = set(columns)
+        positions = [i for i, name in enumerate(all_columns) if name in wanted]
+
+        # Si no existe ninguna columna solicitada se lee una igual, para
+        # conservar la cantidad de filas
+        df_raw = pd.read_excel(
+            path,
+            header=None,
+            skiprows=2,
+            usecols=positions or [0],
+            engine=get_excel_engine()
+        )
+        df = df_raw.iloc[1:, :len(positions)].reset_index(drop=True)
+        df.columns = [all_columns[i] for i in positions]
+        return df
+
+    df_raw = pd.read_excel(path, header=1, engine=get_excel_engine())
+
+    # La primera fila contiene los nombres reales de las columnas
+    new_columns = df_raw.iloc[0].tolist()
+    # Un solo paso: quitar la fila de headers y renumerar (sin copia intermedia)
+    df = df_raw.iloc[1:].reset_index(drop=True)
+
+    # Manejar columnas duplicadas: agregar sufijos
+    df.columns = dedup_column_names(new_columns)
+
+    return df
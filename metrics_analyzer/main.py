@@ -10,6 +10,7 @@ Predictibilidad, Eficiencia y Retrabajo.
 import argparse
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict
 
@@ -37,6 +38,7 @@ from utils import (
     print_warning,
     print_error,
     print_info,
+    print_info_lines,
     format_file_size
 )
 import pandas as pd
@@ -267,8 +269,7 @@ def prompt_sprint_mapping() -> Dict[str, str]:
     """
     print("\n¿Desea usar el mapeo de sprints por defecto?")
     print("Mapeo por defecto:")
-    for sprint, month in DEFAULT_SPRINT_MAPPING.items():
-        print(f"  {sprint} -> {month}")
+    print("\n".join(f"  {sprint} -> {month}" for sprint, month in DEFAULT_SPRINT_MAPPING.items()))
 
     while True:
         choice = input("\nUsar mapeo por defecto? (s/n): ").strip().lower()
@@ -398,14 +399,17 @@ def print_final_report(
         size = Path(month_dashboard_path).stat().st_size
         print_success(f"Dashboard Meses: {month_dashboard_path} ({format_file_size(size)})")
 
-    # Resumen ejecutivo
+    # Resumen ejecutivo (se arma en memoria y se escribe de una sola vez)
+    summary_lines = [
+        f"Sprints analizados: {summary['total_sprints']}",
+        f"Tareas entregadas: {summary['total_delivered']}",
+        f"Throughput promedio: {summary['avg_throughput']:.1f} tareas/sprint",
+        f"Velocity promedio: {summary['avg_velocity']:.1f} puntos/sprint",
+        f"Predictibilidad promedio: {summary['avg_predictability']:.1f}%",
+        f"Eficiencia promedio: {summary['avg_efficiency']:.1f} puntos/persona",
+    ]
     print("\nRESUMEN:")
-    print_info(f"Sprints analizados: {summary['total_sprints']}")
-    print_info(f"Tareas entregadas: {summary['total_delivered']}")
-    print_info(f"Throughput promedio: {summary['avg_throughput']:.1f} tareas/sprint")
-    print_info(f"Velocity promedio: {summary['avg_velocity']:.1f} puntos/sprint")
-    print_info(f"Predictibilidad promedio: {summary['avg_predictability']:.1f}%")
-    print_info(f"Eficiencia promedio: {summary['avg_efficiency']:.1f} puntos/persona")
+    print_info_lines(summary_lines)
 
     # Alertas
     print("\nALERTAS:")
@@ -590,24 +594,35 @@ def run_analyze(args: argparse.Namespace) -> int:
         sprint_dashboard_path = None
         month_dashboard_path = None
 
-        if not args.charts_only:
-            print_section_header("PASO 4: Generación de Reporte Excel")
-            excel_filename = f'{team_name}_Metricas_Performance.xlsx'
-            excel_path = str(output_dir / excel_filename)
-            generate_excel_report(sprint_metrics, month_metrics, summary, excel_path)
-            print_success("Reporte Excel generado")
-
-        if not args.excel_only:
-            print_section_header("PASO 5: Generación de Dashboards")
-            print_info(f"Usando versión de gráficos: {args.chart_version}")
-            sprint_dashboard_path, month_dashboard_path = generate_dashboards(
-                sprint_metrics,
-                month_metrics,
-                str(output_dir),
-                team_name,
-                chart_version=args.chart_version
-            )
-            print_success("Dashboards generados")
+        # El Excel se escribe en un hilo aparte mientras los dashboards se generan
+        # en el hilo principal (pyplot no es seguro para usar desde otros hilos).
+        # Ambos pasos comparten encabezado y cada uno informa al terminar.
+        print_section_header("PASO 4/5: Generación de Reportes")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            excel_future = None
+
+            if not args.charts_only:
+                excel_filename = f'{team_name}_Metricas_Performance.xlsx'
+                excel_path = str(output_dir / excel_filename)
+                excel_future = executor.submit(
+                    generate_excel_report, sprint_metrics, month_metrics, summary, excel_path
+                )
+
+            if not args.excel_only:
+                print_info(f"Usando versión de gráficos: {args.chart_version}")
+                sprint_dashboard_path, month_dashboard_path = generate_dashboards(
+                    sprint_metrics,
+                    month_metrics,
+                    str(output_dir),
+                    team_name,
+                    chart_version=args.chart_version
+                )
+                print_success("Dashboards generados")
+
+            if excel_future is not None:
+                # Propaga cualquier error ocurrido al escribir el Excel
+                excel_future.result()
+                print_success("Reporte Excel generado")
 
         # 6. Reporte final
         print_final_report(
@@ -26,14 +26,35 @@ class MetricsCalculator:
             df: DataFrame procesado con los datos.
             team_size: Número de miembros del equipo.
         """
-        self.df = df.copy()
+        # Copia superficial: el calculador no modifica valores, solo reemplaza
+        # columnas completas (las claves categóricas), lo que no afecta a df
+        self.df = df.copy(deep=False)
         self.team_size = team_size
         self.sprint_metrics: Optional[pd.DataFrame] = None
         self.month_metrics: Optional[pd.DataFrame] = None
+        self._summary: Optional[Dict] = None
+
+        # Claves de agrupación como categorías (categorías ordenadas alfabéticamente):
+        # factorize/groupby trabajan sobre los códigos enteros en lugar de hashear textos
+        for col in ('Sprint', 'Sprint_Unified', 'Month'):
+            if col in self.df.columns:
+                self.df[col] = self.df[col].astype('category')
 
         # Determinar tipos de tareas a trackear (dinámico basado en datos y configuración)
         self.task_types_to_track = get_task_types_to_track(df, 'Tipo Tarea')
 
+        # Máscaras y valores por tarea, extraídos una sola vez y reutilizados
+        # en todas las agregaciones (sprint, mes y resumen)
+        self._delivered_mask = self.df['Is_Delivered'].to_numpy(dtype=bool)
+        self._bug_mask = self.df['Is_Bug'].to_numpy(dtype=bool)
+        self._hdu_mask = (self.df['Tipo Tarea'] == 'HDU').to_numpy(dtype=bool)
+        self._point_weights = _point_weights_by_task(
+            self.df, self._delivered_mask, self._bug_mask, self._hdu_mask
+        )
+        self._delivered_cycle_times = _delivered_cycle_times(
+            self.df, self._delivered_mask, self._hdu_mask
+        )
+
         logger.info(f"Calculador inicializado con {len(df)} tareas y equipo de {team_size} personas")
         logger.info(f"Tipos de tareas detectados: {', '.join(self.task_types_to_track)}")
 
@@ -45,6 +66,9 @@ class MetricsCalculator:
         logger.info("Calculando métricas por mes...")
         self.month_metrics = self._calculate_month_metrics()
 
+        # El resumen se recalcula a partir de las nuevas métricas
+        self._summary = None
+
         logger.info("Cálculo de métricas completado")
 
     def _calculate_sprint_metrics(self) -> pd.DataFrame:
@@ -54,186 +78,125 @@ class MetricsCalculator:
         Sprints con el mismo número base se agrupan juntos.
         Ejemplo: 'Sprint 07 FIDSIN' y 'Sprint 07 Auto3P' se unifican como 'Sprint 7'.
 
+        Todas las métricas se calculan de forma vectorizada: los totales de cada
+        sprint se obtienen en una sola pasada agrupada y los ratios
+        (predictibilidad, eficiencia, retrabajo) como aritmética de columnas.
+
         Returns:
             DataFrame con métricas por sprint unificado.
         """
-        # Usar Sprint_Unified en lugar de Sprint para agrupar
-        unified_sprints = sorted(self.df['Sprint_Unified'].unique())
-        metrics = []
-
-        for unified_sprint in unified_sprints:
-            # Obtener todas las tareas con el mismo sprint unificado
-            sprint_data = self.df[self.df['Sprint_Unified'] == unified_sprint]
-
-            # Obtener nombres originales de sprints que se están unificando
-            original_sprints = sprint_data['Sprint'].unique()
-
-            sprint_metrics = self._calculate_single_sprint_metrics(
-                unified_sprint,
-                sprint_data,
-                original_sprints
-            )
-            metrics.append(sprint_metrics)
-
-        df_metrics = pd.DataFrame(metrics)
-        return df_metrics
-
-    def _calculate_single_sprint_metrics(
-        self,
-        sprint: str,
-        sprint_data: pd.DataFrame,
-        original_sprints: list = None
-    ) -> Dict:
-        """
-        Calcula métricas para un sprint unificado.
-
-        Args:
-            sprint: Nombre del sprint unificado.
-            sprint_data: DataFrame filtrado para el sprint (puede incluir múltiples sprints originales).
-            original_sprints: Lista de nombres originales de sprints que se unifican.
+        # Usar Sprint_Unified en lugar de Sprint para agrupar.
+        # Se factoriza una sola vez (códigos en orden alfabético).
+        codes, unified_sprints = pd.factorize(self.df['Sprint_Unified'], sort=True)
+        n_sprints = len(unified_sprints)
+        if n_sprints == 0:
+            return pd.DataFrame()
 
-        Returns:
-            Diccionario con todas las métricas del sprint.
-        """
-        # Tareas entregadas (incluye todas las tareas, originales y copias)
-        delivered = sprint_data[sprint_data['Is_Delivered']]
+        totals = _sum_by_group(self._point_weights, codes, n_sprints)
+        cycle_times = _cycle_time_stats_by_group(self._delivered_cycle_times, codes, n_sprints)
 
         # 1. THROUGHPUT: Número de tareas entregadas
-        throughput = len(delivered)
+        throughput = totals['delivered_tasks'].astype(np.int64)
 
         # 2. VELOCITY: Suma de:
         #    - Estimación Original de tareas que llegaron al DoD (entregadas)
         #    - Puntos Logrados de tareas que NO llegaron al DoD (no entregadas)
-        not_delivered = sprint_data[~sprint_data['Is_Delivered']]
-
-        velocity_delivered = delivered['Estimación Original'].sum()
-        velocity_not_delivered = not_delivered['Puntos Logrados'].fillna(0).sum()
-        velocity = velocity_delivered + velocity_not_delivered
-
-        # 3. CYCLE TIME: Promedio y mediana
-        cycle_times = delivered['Cycle_Time_Days'].dropna()
-        cycle_time_avg = cycle_times.mean() if len(cycle_times) > 0 else np.nan
-        cycle_time_median = cycle_times.median() if len(cycle_times) > 0 else np.nan
-
-        # 3b. CYCLE TIME HDU: Solo tareas HDU
-        hdu_delivered = delivered[delivered['Tipo Tarea'] == 'HDU']
-        cycle_times_hdu = hdu_delivered['Cycle_Time_Days'].dropna()
-        cycle_time_hdu_avg = cycle_times_hdu.mean() if len(cycle_times_hdu) > 0 else np.nan
-        cycle_time_hdu_median = cycle_times_hdu.median() if len(cycle_times_hdu) > 0 else np.nan
+        velocity = totals['delivered_points'] + totals['not_delivered_achieved']
 
         # 4. PREDICTIBILIDAD: Puntos entregados / Total puntos comprometidos
         # Puntos comprometidos = Estimación Original de TODAS las tareas del sprint
         # Puntos entregados = Estimación Original de tareas completadas
-        committed_points = sprint_data['Estimación Original'].sum()
-        delivered_points = delivered['Estimación Original'].sum()
-
-        if committed_points > 0:
-            predictability = (delivered_points / committed_points) * 100
-        else:
-            predictability = np.nan
+        committed_points = totals['committed_points']
+        delivered_points = totals['delivered_points']
+        predictability = _percentage(delivered_points, committed_points)
 
         # 4b. PREDICTIBILIDAD HDU: Solo considerando tareas HDU
-        hdu_tasks = sprint_data[sprint_data['Tipo Tarea'] == 'HDU']
-        hdu_delivered = hdu_tasks[hdu_tasks['Is_Delivered']]
-        committed_points_hdu = hdu_tasks['Estimación Original'].sum()
-        delivered_points_hdu = hdu_delivered['Estimación Original'].sum()
-
-        if committed_points_hdu > 0:
-            predictability_hdu = (delivered_points_hdu / committed_points_hdu) * 100
-        else:
-            predictability_hdu = np.nan
-
-        # TOTAL ESTIMADO: Suma de Estimación Original de todas las tareas del sprint
-        total_estimated = sprint_data['Estimación Original'].sum()
+        committed_points_hdu = totals['committed_points_hdu']
+        delivered_points_hdu = totals['delivered_points_hdu']
+        predictability_hdu = _percentage(delivered_points_hdu, committed_points_hdu)
 
         # 5. EFICIENCIA: Velocity / Miembros del equipo
-        efficiency = velocity / self.team_size if self.team_size > 0 else np.nan
+        if self.team_size > 0:
+            efficiency = velocity / self.team_size
+        else:
+            efficiency = np.full(n_sprints, np.nan)
 
         # 6. RETRABAJO (basado en Estimación Original): Puntos estimados de bugs / Total puntos estimados entregados
-        bugs_delivered = delivered[delivered['Is_Bug']]
-        bug_points_estimated = bugs_delivered['Estimación Original'].sum()
-        total_points_estimated = delivered['Estimación Original'].sum()
-
-        if total_points_estimated > 0:
-            rework = (bug_points_estimated / total_points_estimated) * 100
-        else:
-            rework = np.nan
+        bug_points_estimated = totals['bug_points_delivered']
+        rework = _percentage(bug_points_estimated, delivered_points)
 
         # 6b. RETRABAJO SOBRE VELOCITY (basado en Estimación Original):
         # Puntos de historia de bugs entregados / Velocity
-        # Usa Estimación Original de bugs entregados dividido por el velocity total del sprint
-        if velocity > 0:
-            rework_achieved = (bug_points_estimated / velocity) * 100
-        else:
-            rework_achieved = np.nan
+        rework_achieved = _percentage(bug_points_estimated, velocity)
 
         # 6c. RETRABAJO SOBRE VELOCITY (basado en Puntos Logrados/Efectivos):
-        # Puntos logrados o entregados de bugs / Velocity
         # Para cada bug, usa Puntos Logrados si existe, sino Estimación Original
-        bug_points_effective = 0
-        for _, bug_row in bugs_delivered.iterrows():
-            if pd.notna(bug_row['Puntos Logrados']):
-                bug_points_effective += bug_row['Puntos Logrados']
-            else:
-                bug_points_effective += bug_row['Estimación Original']
-
-        if velocity > 0:
-            rework_velocity = (bug_points_effective / velocity) * 100
+        rework_velocity = _percentage(totals['bug_points_effective'], velocity)
+
+        # Mes del sprint: el de su primera tarea (si está disponible)
+        if 'Month' in self.df.columns:
+            _, first_rows = np.unique(codes, return_index=True)
+            first_rows = first_rows[-n_sprints:]  # descartar el código -1 (sin sprint)
+            first_months = self.df['Month'].iloc[first_rows]
+            months = first_months.astype(object).where(first_months.notna(), None).tolist()
         else:
-            rework_velocity = np.nan
-
-        # Obtener el mes si está disponible
-        month = sprint_data['Month'].iloc[0] if 'Month' in sprint_data.columns else None
-
-        # Crear descripción de sprints originales si hay múltiples
-        original_sprints_str = ', '.join(sorted(original_sprints)) if original_sprints is not None and len(original_sprints) > 1 else None
-
-        # Conteo dinámico de tareas entregadas por tipo
-        task_type_counts = {}
-        for task_type in self.task_types_to_track:
-            count = len(delivered[delivered['Tipo Tarea'] == task_type])
-            task_type_counts[f'{task_type}_Delivered'] = count
-
-        # Construir diccionario de retorno
-        result = {
-            'Sprint': sprint,
-            'Original_Sprints': original_sprints_str,  # Nuevo campo
-            'Month': month,
+            months = [None] * n_sprints
+
+        # Descripción de sprints originales si hay múltiples
+        original_sprints = self.df.groupby(codes, sort=True)['Sprint'].unique()
+        original_sprints_str = [
+            ', '.join(sorted(names)) if len(names) > 1 else None
+            for names in original_sprints.reindex(range(n_sprints))
+        ]
+
+        # Todas las columnas se reúnen primero y el DataFrame se construye una sola vez
+        columns = {
+            'Sprint': list(unified_sprints),
+            'Original_Sprints': original_sprints_str,
+            'Month': months,
             'Throughput': throughput,
             'Velocity': velocity,
-            'Total_Estimated': total_estimated,
-            'Cycle_Time_Avg': cycle_time_avg,
-            'Cycle_Time_Median': cycle_time_median,
-            'Cycle_Time_HDU_Avg': cycle_time_hdu_avg,
-            'Cycle_Time_HDU_Median': cycle_time_hdu_median,
+            'Total_Estimated': committed_points,
+            'Cycle_Time_Avg': cycle_times['avg'],
+            'Cycle_Time_Median': cycle_times['median'],
+            'Cycle_Time_HDU_Avg': cycle_times['hdu_avg'],
+            'Cycle_Time_HDU_Median': cycle_times['hdu_median'],
             'Predictability': predictability,
             'Predictability_HDU': predictability_hdu,
             'Efficiency': efficiency,
             'Rework': rework,
             'Rework_Achieved': rework_achieved,
             'Rework_Velocity': rework_velocity,
-            'Total_Tasks': len(sprint_data),
+            'Total_Tasks': totals['tasks'].astype(np.int64),
             'Delivered_Tasks': throughput,
         }
 
-        # Agregar conteos de tipos de tareas dinámicamente
-        result.update(task_type_counts)
+        # Conteo dinámico de tareas entregadas por tipo
+        delivered_types = self.df['Tipo Tarea'].where(self._delivered_mask)
+        for task_type in self.task_types_to_track:
+            is_type = (delivered_types == task_type).to_numpy(dtype=float)
+            columns[f'{task_type}_Delivered'] = _bincount_by_group(codes, is_type, n_sprints).astype(np.int64)
 
-        # Agregar campos adicionales
-        result.update({
+        columns.update({
             'Bug_Points_Estimated': bug_points_estimated,
-            'Total_Points_Estimated': total_points_estimated,
+            'Total_Points_Estimated': delivered_points,
             'Committed_Points': committed_points,
             'Delivered_Points': delivered_points,
             'Committed_Points_HDU': committed_points_hdu,
-            'Delivered_Points_HDU': delivered_points_hdu
+            'Delivered_Points_HDU': delivered_points_hdu,
         })
 
-        return result
+        df_metrics = pd.DataFrame(columns)
+        return df_metrics
 
     def _calculate_month_metrics(self) -> pd.DataFrame:
         """
-        Calcula métricas por mes.
+        Calcula métricas por mes usando sprints unificados.
+
+        Primero se agregan los totales por par (mes, sprint unificado) y luego
+        se resumen por mes (promedios de los sprints del mes). Las métricas
+        que se calculan sobre todas las tareas del mes (medianas de Cycle Time
+        y retrabajo) se agregan directamente por mes.
 
         Returns:
             DataFrame con métricas por mes.
@@ -242,201 +205,102 @@ class MetricsCalculator:
             logger.warning("No hay mapeo de meses disponible")
             return pd.DataFrame()
 
-        months = sorted(self.df['Month'].dropna().unique())
-        metrics = []
-
-        for month in months:
-            month_data = self.df[self.df['Month'] == month]
-            month_metrics = self._calculate_single_month_metrics(month, month_data)
-            metrics.append(month_metrics)
-
-        df_metrics = pd.DataFrame(metrics)
-        return df_metrics
-
-    def _calculate_single_month_metrics(self, month: str, month_data: pd.DataFrame) -> Dict:
-        """
-        Calcula métricas para un mes específico usando sprints unificados.
-
-        Args:
-            month: Nombre del mes.
-            month_data: DataFrame filtrado para el mes.
-
-        Returns:
-            Diccionario con todas las métricas del mes.
-        """
-        # Obtener sprints UNIFICADOS del mes
-        unified_sprints_in_month = month_data['Sprint_Unified'].unique()
-        num_sprints = len(unified_sprints_in_month)
-
-        # Tareas entregadas (incluye todas las tareas)
-        delivered = month_data[month_data['Is_Delivered']]
+        month_codes, months = pd.factorize(self.df['Month'], sort=True)
+        sprint_codes, unified_sprints = pd.factorize(self.df['Sprint_Unified'], sort=True)
+        n_months = len(months)
+
+        # Pares (mes, sprint unificado) presentes en los datos, ordenados por mes y sprint
+        has_pair = (month_codes >= 0) & (sprint_codes >= 0)
+        pair_codes = np.full(len(self.df), -1, dtype=np.intp)
+        pair_codes[has_pair], pairs = pd.factorize(
+            month_codes[has_pair] * len(unified_sprints) + sprint_codes[has_pair], sort=True
+        )
+        n_pairs = len(pairs)
+
+        pair_totals = _sum_by_group(self._point_weights, pair_codes, n_pairs)
+        pair_cycle_times = _cycle_time_stats_by_group(self._delivered_cycle_times, pair_codes, n_pairs)
+
+        # Métricas de cada sprint UNIFICADO dentro de su mes
+        sprints_in_month = pd.DataFrame({
+            'Month': pairs // len(unified_sprints),
+            'Sprint': np.asarray(unified_sprints, dtype=object)[pairs % len(unified_sprints)],
+            # Velocity = Estimación Original de entregadas + Puntos Logrados de no entregadas
+            'Velocity': pair_totals['delivered_points'] + pair_totals['not_delivered_achieved'],
+            'Total_Estimated': pair_totals['committed_points'],
+            # Solo promedian los sprints con Cycle Time / puntos comprometidos (el resto es NaN)
+            'Cycle_Time_Avg': pair_cycle_times['avg'],
+            'Cycle_Time_HDU_Avg': pair_cycle_times['hdu_avg'],
+            'Predictability': _percentage(pair_totals['delivered_points'], pair_totals['committed_points']),
+            'Predictability_HDU': _percentage(pair_totals['delivered_points_hdu'], pair_totals['committed_points_hdu']),
+        })
+        by_month = sprints_in_month.groupby('Month', sort=True).agg(
+            Num_Sprints=('Sprint', 'size'),
+            Sprints=('Sprint', ', '.join),
+            Velocity_Total=('Velocity', 'sum'),
+            Velocity_Avg=('Velocity', 'mean'),
+            Total_Estimated_Total=('Total_Estimated', 'sum'),
+            Total_Estimated_Avg=('Total_Estimated', 'mean'),
+            Cycle_Time_Avg=('Cycle_Time_Avg', 'mean'),
+            Cycle_Time_HDU_Avg=('Cycle_Time_HDU_Avg', 'mean'),
+            Predictability=('Predictability', 'mean'),
+            Predictability_HDU=('Predictability_HDU', 'mean'),
+        )
+
+        # Totales sobre todas las tareas del mes
+        month_totals = _sum_by_group(self._point_weights, month_codes, n_months)
+        month_cycle_times = _cycle_time_stats_by_group(self._delivered_cycle_times, month_codes, n_months)
+
+        num_sprints = by_month['Num_Sprints'].to_numpy()
+        velocity_avg = by_month['Velocity_Avg'].to_numpy()
+        velocity_total = by_month['Velocity_Total'].to_numpy()
 
         # 1. THROUGHPUT: Total de tareas entregadas en el mes
-        throughput_total = len(delivered)
-        throughput_avg = throughput_total / num_sprints if num_sprints > 0 else np.nan
-
-        # 2. VELOCITY: Promedio de velocity de los sprints UNIFICADOS del mes
-        sprint_velocities = []
-        for unified_sprint in unified_sprints_in_month:
-            sprint_data = month_data[month_data['Sprint_Unified'] == unified_sprint]
-            sprint_delivered = sprint_data[sprint_data['Is_Delivered']]
-            sprint_not_delivered = sprint_data[~sprint_data['Is_Delivered']]
-
-            # Velocity = Estimación Original de entregadas + Puntos Logrados de no entregadas
-            velocity_delivered = sprint_delivered['Estimación Original'].sum()
-            velocity_not_delivered = sprint_not_delivered['Puntos Logrados'].fillna(0).sum()
-            velocity = velocity_delivered + velocity_not_delivered
-
-            sprint_velocities.append(velocity)
-
-        velocity_avg = np.mean(sprint_velocities) if sprint_velocities else np.nan
-        velocity_total = sum(sprint_velocities) if sprint_velocities else 0
-
-        # 3. CYCLE TIME: Promedio de los promedios de cada sprint UNIFICADO
-        sprint_cycle_times = []
-        for unified_sprint in unified_sprints_in_month:
-            sprint_data = month_data[month_data['Sprint_Unified'] == unified_sprint]
-            sprint_delivered = sprint_data[sprint_data['Is_Delivered']]
-
-            cycle_times = sprint_delivered['Cycle_Time_Days'].dropna()
-            if len(cycle_times) > 0:
-                sprint_avg = cycle_times.mean()
-                sprint_cycle_times.append(sprint_avg)
-
-        cycle_time_avg = np.mean(sprint_cycle_times) if sprint_cycle_times else np.nan
-
-        # Mediana calculada sobre todas las tareas del mes (no cambia)
-        all_cycle_times = delivered['Cycle_Time_Days'].dropna()
-        cycle_time_median = all_cycle_times.median() if len(all_cycle_times) > 0 else np.nan
-
-        # 3b. CYCLE TIME HDU: Promedio de los promedios de cada sprint (solo HDU)
-        sprint_cycle_times_hdu = []
-        for unified_sprint in unified_sprints_in_month:
-            sprint_data = month_data[month_data['Sprint_Unified'] == unified_sprint]
-            sprint_delivered = sprint_data[sprint_data['Is_Delivered']]
-            hdu_delivered = sprint_delivered[sprint_delivered['Tipo Tarea'] == 'HDU']
-
-            cycle_times_hdu = hdu_delivered['Cycle_Time_Days'].dropna()
-            if len(cycle_times_hdu) > 0:
-                sprint_avg_hdu = cycle_times_hdu.mean()
-                sprint_cycle_times_hdu.append(sprint_avg_hdu)
-
-        cycle_time_hdu_avg = np.mean(sprint_cycle_times_hdu) if sprint_cycle_times_hdu else np.nan
-
-        # Mediana HDU calculada sobre todas las tareas HDU del mes
-        hdu_delivered_all = delivered[delivered['Tipo Tarea'] == 'HDU']
-        all_cycle_times_hdu = hdu_delivered_all['Cycle_Time_Days'].dropna()
-        cycle_time_hdu_median = all_cycle_times_hdu.median() if len(all_cycle_times_hdu) > 0 else np.nan
-
-        # 4. PREDICTIBILIDAD: Promedio de predictibilidad de sprints UNIFICADOS del mes
-        sprint_predictabilities = []
-        for unified_sprint in unified_sprints_in_month:
-            sprint_data = month_data[month_data['Sprint_Unified'] == unified_sprint]
-            sprint_delivered = sprint_data[sprint_data['Is_Delivered']]
-
-            # Comprometido = TODAS las tareas del sprint unificado
-            committed = sprint_data['Estimación Original'].sum()
-            # Entregado = Tareas completadas
-            delivered_pts = sprint_delivered['Estimación Original'].sum()
-
-            if committed > 0:
-                pred = (delivered_pts / committed) * 100
-                sprint_predictabilities.append(pred)
-
-        predictability = np.mean(sprint_predictabilities) if sprint_predictabilities else np.nan
-
-        # 4b. PREDICTIBILIDAD HDU: Promedio de predictibilidad HDU de sprints UNIFICADOS del mes
-        sprint_predictabilities_hdu = []
-        for unified_sprint in unified_sprints_in_month:
-            sprint_data = month_data[month_data['Sprint_Unified'] == unified_sprint]
-            hdu_tasks = sprint_data[sprint_data['Tipo Tarea'] == 'HDU']
-            hdu_delivered = hdu_tasks[hdu_tasks['Is_Delivered']]
-
-            # Comprometido HDU = TODAS las tareas HDU del sprint unificado
-            committed_hdu = hdu_tasks['Estimación Original'].sum()
-            # Entregado HDU = Tareas HDU completadas
-            delivered_pts_hdu = hdu_delivered['Estimación Original'].sum()
-
-            if committed_hdu > 0:
-                pred_hdu = (delivered_pts_hdu / committed_hdu) * 100
-                sprint_predictabilities_hdu.append(pred_hdu)
-
-        predictability_hdu = np.mean(sprint_predictabilities_hdu) if sprint_predictabilities_hdu else np.nan
-
-        # TOTAL ESTIMADO: Suma y promedio de Estimación Original por mes
-        sprint_totals_estimated = []
-        for unified_sprint in unified_sprints_in_month:
-            sprint_data = month_data[month_data['Sprint_Unified'] == unified_sprint]
-            total_est = sprint_data['Estimación Original'].sum()
-            sprint_totals_estimated.append(total_est)
-
-        total_estimated_total = sum(sprint_totals_estimated) if sprint_totals_estimated else 0
-        total_estimated_avg = np.mean(sprint_totals_estimated) if sprint_totals_estimated else np.nan
+        throughput_total = month_totals['delivered_tasks'].astype(np.int64)
 
         # 5. EFICIENCIA: Promedio de eficiencia de sprints del mes
-        efficiency_avg = velocity_avg / self.team_size if self.team_size > 0 else np.nan
-
-        # 6. RETRABAJO (basado en Estimación Original): Puntos estimados de bugs / Total puntos estimados entregados
-        bugs_delivered = delivered[delivered['Is_Bug']]
-        bug_points_estimated = bugs_delivered['Estimación Original'].sum()
-        total_points_estimated = delivered['Estimación Original'].sum()
-
-        if total_points_estimated > 0:
-            rework = (bug_points_estimated / total_points_estimated) * 100
-        else:
-            rework = np.nan
-
-        # 6b. RETRABAJO SOBRE VELOCITY (basado en Estimación Original):
-        # Puntos de historia de bugs entregados / Velocity total del mes
-        # Usa Estimación Original de bugs entregados dividido por el velocity total del mes
-        if velocity_total > 0:
-            rework_achieved = (bug_points_estimated / velocity_total) * 100
+        if self.team_size > 0:
+            efficiency_avg = velocity_avg / self.team_size
         else:
-            rework_achieved = np.nan
+            efficiency_avg = np.full(n_months, np.nan)
 
-        # 6c. RETRABAJO SOBRE VELOCITY (basado en Puntos Logrados/Efectivos):
-        # Puntos logrados o entregados de bugs / Velocity
-        # Para cada bug, usa Puntos Logrados si existe, sino Estimación Original
-        bug_points_effective = 0
-        for _, bug_row in bugs_delivered.iterrows():
-            if pd.notna(bug_row['Puntos Logrados']):
-                bug_points_effective += bug_row['Puntos Logrados']
-            else:
-                bug_points_effective += bug_row['Estimación Original']
-
-        if velocity_total > 0:
-            rework_velocity = (bug_points_effective / velocity_total) * 100
-        else:
-            rework_velocity = np.nan
+        # 6. RETRABAJO (basado en Estimación Original): Puntos estimados de bugs / Total puntos estimados entregados
+        bug_points_estimated = month_totals['bug_points_delivered']
 
-        return {
-            'Month': month,
+        df_metrics = pd.DataFrame({
+            'Month': list(months),
             'Num_Sprints': num_sprints,
-            'Sprints': ', '.join(sorted(unified_sprints_in_month)),  # Mostrar sprints unificados
+            'Sprints': by_month['Sprints'].tolist(),  # Mostrar sprints unificados
             'Throughput_Total': throughput_total,
-            'Throughput_Avg': throughput_avg,
+            'Throughput_Avg': throughput_total / num_sprints,
             'Velocity_Total': velocity_total,
             'Velocity_Avg': velocity_avg,
-            'Total_Estimated_Total': total_estimated_total,
-            'Total_Estimated_Avg': total_estimated_avg,
-            'Cycle_Time_Avg': cycle_time_avg,
-            'Cycle_Time_Median': cycle_time_median,
-            'Cycle_Time_HDU_Avg': cycle_time_hdu_avg,
-            'Cycle_Time_HDU_Median': cycle_time_hdu_median,
-            'Predictability': predictability,
-            'Predictability_HDU': predictability_hdu,
+            'Total_Estimated_Total': by_month['Total_Estimated_Total'].to_numpy(),
+            'Total_Estimated_Avg': by_month['Total_Estimated_Avg'].to_numpy(),
+            'Cycle_Time_Avg': by_month['Cycle_Time_Avg'].to_numpy(),
+            # Medianas calculadas sobre todas las tareas del mes
+            'Cycle_Time_Median': month_cycle_times['median'],
+            'Cycle_Time_HDU_Avg': by_month['Cycle_Time_HDU_Avg'].to_numpy(),
+            'Cycle_Time_HDU_Median': month_cycle_times['hdu_median'],
+            'Predictability': by_month['Predictability'].to_numpy(),
+            'Predictability_HDU': by_month['Predictability_HDU'].to_numpy(),
             'Efficiency': efficiency_avg,
-            'Rework': rework,
-            'Rework_Achieved': rework_achieved,
-            'Rework_Velocity': rework_velocity,
-            'Total_Tasks': len(month_data),
-            'Delivered_Tasks': throughput_total
-        }
+            'Rework': _percentage(bug_points_estimated, month_totals['delivered_points']),
+            # 6b. RETRABAJO SOBRE VELOCITY: bugs entregados (Estimación Original) / Velocity total del mes
+            'Rework_Achieved': _percentage(bug_points_estimated, velocity_total),
+            # 6c. RETRABAJO SOBRE VELOCITY: bugs entregados (Puntos Logrados o, si no hay, Estimación Original)
+            'Rework_Velocity': _percentage(month_totals['bug_points_effective'], velocity_total),
+            'Total_Tasks': month_totals['tasks'].astype(np.int64),
+            'Delivered_Tasks': throughput_total,
+        })
+        return df_metrics
 
     def get_sprint_metrics(self) -> pd.DataFrame:
         """
         Obtiene las métricas por sprint.
 
+        El DataFrame se comparte con el calculador (no se copia): debe
+        tratarse como de solo lectura.
+
         Returns:
             DataFrame con métricas por sprint.
 
@@ -446,12 +310,15 @@ class MetricsCalculator:
         if self.sprint_metrics is None:
             raise ValueError("Las métricas no han sido calculadas. Ejecute calculate_all_metrics() primero.")
 
-        return self.sprint_metrics.copy()
+        return self.sprint_metrics
 
     def get_month_metrics(self) -> pd.DataFrame:
         """
         Obtiene las métricas por mes.
 
+        El DataFrame se comparte con el calculador (no se copia): debe
+        tratarse como de solo lectura.
+
         Returns:
             DataFrame con métricas por mes.
 
@@ -461,60 +328,64 @@ class MetricsCalculator:
         if self.month_metrics is None:
             raise ValueError("Las métricas no han sido calculadas. Ejecute calculate_all_metrics() primero.")
 
-        return self.month_metrics.copy()
+        return self.month_metrics
 
     def get_summary(self) -> Dict:
         """
         Obtiene un resumen ejecutivo de las métricas.
 
+        El resumen se calcula una sola vez y se reutiliza en las llamadas
+        siguientes (p. ej. print_summary y el reporte final).
+
         Returns:
             Diccionario con resumen de métricas.
         """
         if self.sprint_metrics is None:
             raise ValueError("Las métricas no han sido calculadas.")
 
-        # Métricas generales
+        if self._summary is not None:
+            return self._summary
+
+        # Métricas generales (todos los promedios en una sola reducción)
         total_sprints = len(self.sprint_metrics)
-        total_delivered = self.sprint_metrics['Throughput'].sum()
-        avg_throughput = self.sprint_metrics['Throughput'].mean()
-        avg_velocity = self.sprint_metrics['Velocity'].mean()
-        avg_cycle_time = self.sprint_metrics['Cycle_Time_Avg'].mean()
-        avg_predictability = self.sprint_metrics['Predictability'].mean()
-        avg_efficiency = self.sprint_metrics['Efficiency'].mean()
-        avg_rework = self.sprint_metrics['Rework'].mean()
-        avg_rework_achieved = self.sprint_metrics['Rework_Achieved'].mean()
-        avg_rework_velocity = self.sprint_metrics['Rework_Velocity'].mean()
-
-        # Mejor y peor sprint por throughput
-        best_sprint = self.sprint_metrics.loc[self.sprint_metrics['Throughput'].idxmax()]
-        worst_sprint = self.sprint_metrics.loc[self.sprint_metrics['Throughput'].idxmin()]
+        throughput = self.sprint_metrics['Throughput'].to_numpy()
+        total_delivered = throughput.sum()
+        averages = self.sprint_metrics[[
+            'Throughput', 'Velocity', 'Cycle_Time_Avg', 'Predictability', 'Efficiency',
+            'Rework', 'Rework_Achieved', 'Rework_Velocity'
+        ]].mean()
+
+        # Mejor y peor sprint por throughput (posición del primer máximo/mínimo)
+        sprint_names = self.sprint_metrics['Sprint']
+        best_pos = int(np.argmax(throughput))
+        worst_pos = int(np.argmin(throughput))
 
         # Conteo dinámico de tareas entregadas por tipo
-        delivered_tasks = self.df[self.df['Is_Delivered']]
-        task_type_summary = {}
-        for task_type in self.task_types_to_track:
-            count = len(delivered_tasks[delivered_tasks['Tipo Tarea'] == task_type])
-            task_type_summary[f'{task_type.lower()}_delivered'] = count
+        delivered_counts = self.df['Tipo Tarea'][self._delivered_mask].value_counts()
+        task_type_summary = {
+            f'{task_type.lower()}_delivered': int(delivered_counts.get(task_type, 0))
+            for task_type in self.task_types_to_track
+        }
 
         # Construir diccionario base
         result = {
             'total_sprints': total_sprints,
             'total_delivered': int(total_delivered),
-            'avg_throughput': avg_throughput,
-            'avg_velocity': avg_velocity,
-            'avg_cycle_time': avg_cycle_time,
-            'avg_predictability': avg_predictability,
-            'avg_efficiency': avg_efficiency,
-            'avg_rework': avg_rework,
-            'avg_rework_achieved': avg_rework_achieved,
-            'avg_rework_velocity': avg_rework_velocity,
+            'avg_throughput': averages['Throughput'],
+            'avg_velocity': averages['Velocity'],
+            'avg_cycle_time': averages['Cycle_Time_Avg'],
+            'avg_predictability': averages['Predictability'],
+            'avg_efficiency': averages['Efficiency'],
+            'avg_rework': averages['Rework'],
+            'avg_rework_achieved': averages['Rework_Achieved'],
+            'avg_rework_velocity': averages['Rework_Velocity'],
             'best_sprint': {
-                'name': best_sprint['Sprint'],
-                'throughput': int(best_sprint['Throughput'])
+                'name': sprint_names.iat[best_pos],
+                'throughput': int(throughput[best_pos])
             },
             'worst_sprint': {
-                'name': worst_sprint['Sprint'],
-                'throughput': int(worst_sprint['Throughput'])
+                'name': sprint_names.iat[worst_pos],
+                'throughput': int(throughput[worst_pos])
             },
             'team_size': self.team_size
         }
@@ -522,6 +393,7 @@ class MetricsCalculator:
         # Agregar conteos de tipos de tareas
         result.update(task_type_summary)
 
+        self._summary = result
         return result
 
     def print_summary(self) -> None:
@@ -545,6 +417,157 @@ class MetricsCalculator:
         print(f"PEOR SPRINT: {summary['worst_sprint']['name']} ({summary['worst_sprint']['throughput']} tareas)")
 
 
+def _bincount_by_group(codes: np.ndarray, weights: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Suma weights por grupo con np.bincount, ignorando las filas sin grupo.
+
+    Args:
+        codes: Código de grupo de cada fila (resultado de pd.factorize; -1 = sin grupo).
+        weights: Valor a sumar de cada fila (un NaN hace NaN la suma de su grupo).
+        n_groups: Número de grupos.
+
+    Returns:
+        Array con la suma de cada grupo.
+    """
+    valid = codes >= 0
+    return np.bincount(codes[valid], weights=weights[valid], minlength=n_groups)
+
+
+def _point_weights_by_task(
+    df: pd.DataFrame,
+    is_delivered: np.ndarray,
+    is_bug: np.ndarray,
+    is_hdu: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Calcula, por tarea, el aporte a cada suma de puntos y conteo agregado.
+
+    Los valores NaN no aportan (mismo comportamiento que Series.sum()), salvo
+    en 'bug_points_effective', donde un bug entregado sin Puntos Logrados ni
+    Estimación Original deja en NaN la suma de su grupo.
+
+    Args:
+        df: DataFrame procesado.
+        is_delivered: Máscara de tareas entregadas.
+        is_bug: Máscara de bugs.
+        is_hdu: Máscara de tareas HDU.
+
+    Returns:
+        Diccionario {nombre_total: array con el aporte de cada tarea}.
+    """
+    estimation_raw = df['Estimación Original'].to_numpy(dtype=float, na_value=np.nan)
+    achieved_raw = df['Puntos Logrados'].to_numpy(dtype=float, na_value=np.nan)
+    estimation = np.nan_to_num(estimation_raw)
+    achieved = np.nan_to_num(achieved_raw)
+    is_delivered_bug = is_delivered & is_bug
+
+    # Puntos efectivos de bugs: Puntos Logrados si existe, sino Estimación Original
+    bug_effective = np.where(np.isnan(achieved_raw), estimation_raw, achieved_raw)
+
+    return {
+        'tasks': np.ones(len(df)),
+        'delivered_tasks': is_delivered.astype(float),
+        'committed_points': estimation,
+        'delivered_points': np.where(is_delivered, estimation, 0.0),
+        'not_delivered_achieved': np.where(is_delivered, 0.0, achieved),
+        'committed_points_hdu': np.where(is_hdu, estimation, 0.0),
+        'delivered_points_hdu': np.where(is_delivered & is_hdu, estimation, 0.0),
+        'bug_points_delivered': np.where(is_delivered_bug, estimation, 0.0),
+        'bug_points_effective': np.where(is_delivered_bug, bug_effective, 0.0),
+    }
+
+
+def _sum_by_group(weights: Dict[str, np.ndarray], codes: np.ndarray, n_groups: int) -> Dict[str, np.ndarray]:
+    """
+    Suma los aportes por tarea de cada grupo en una sola pasada por total.
+
+    Todas las sumas se obtienen con np.bincount sobre arrays NumPy, en lugar de
+    filtrar el DataFrame una vez por grupo.
+
+    Args:
+        weights: Aportes por tarea (ver _point_weights_by_task).
+        codes: Código de grupo de cada fila (resultado de pd.factorize; -1 = sin grupo).
+        n_groups: Número de grupos.
+
+    Returns:
+        Diccionario {nombre_total: array con un valor por grupo}.
+    """
+    return {
+        name: _bincount_by_group(codes, values, n_groups)
+        for name, values in weights.items()
+    }
+
+
+def _delivered_cycle_times(df: pd.DataFrame, is_delivered: np.ndarray, is_hdu: np.ndarray) -> pd.DataFrame:
+    """
+    Obtiene el Cycle Time de las tareas entregadas (todas y solo HDU).
+
+    Args:
+        df: DataFrame procesado.
+        is_delivered: Máscara de tareas entregadas.
+        is_hdu: Máscara de tareas HDU.
+
+    Returns:
+        DataFrame con columnas 'all' y 'hdu' (NaN en las tareas que no cuentan).
+    """
+    cycle_time = df['Cycle_Time_Days'].to_numpy(dtype=float, na_value=np.nan)
+    delivered_cycle = np.where(is_delivered, cycle_time, np.nan)
+    return pd.DataFrame({
+        'all': delivered_cycle,
+        'hdu': np.where(is_hdu, delivered_cycle, np.nan),
+    })
+
+
+def _cycle_time_stats_by_group(
+    delivered_cycle_times: pd.DataFrame,
+    codes: np.ndarray,
+    n_groups: int
+) -> Dict[str, np.ndarray]:
+    """
+    Calcula promedio y mediana del Cycle Time de las tareas entregadas de cada grupo.
+
+    Se agrupa una sola vez sobre el Cycle Time de las entregadas (todas y solo
+    HDU); los grupos sin valores quedan en NaN.
+
+    Args:
+        delivered_cycle_times: Cycle Time por tarea (ver _delivered_cycle_times).
+        codes: Código de grupo de cada fila (resultado de pd.factorize; -1 = sin grupo).
+        n_groups: Número de grupos.
+
+    Returns:
+        Diccionario con 'avg', 'median', 'hdu_avg' y 'hdu_median' (un valor por grupo).
+    """
+    valid = codes >= 0
+    stats = (
+        delivered_cycle_times[valid]
+        .groupby(codes[valid], sort=True)
+        .agg(['mean', 'median'])
+        .reindex(range(n_groups))
+    )
+
+    return {
+        'avg': stats[('all', 'mean')].to_numpy(),
+        'median': stats[('all', 'median')].to_numpy(),
+        'hdu_avg': stats[('hdu', 'mean')].to_numpy(),
+        'hdu_median': stats[('hdu', 'median')].to_numpy(),
+    }
+
+
+def _percentage(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """
+    Calcula numerator / denominator * 100 por grupo (NaN donde denominator <= 0).
+
+    Args:
+        numerator: Valores del numerador.
+        denominator: Valores del denominador.
+
+    Returns:
+        Array con el porcentaje de cada grupo.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, (numerator / denominator) * 100, np.nan)
+
+
 def calculate_metrics(
     df: pd.DataFrame,
     team_size: int,
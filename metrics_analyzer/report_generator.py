@@ -376,7 +376,8 @@ def generate_excel_report(
     sprint_metrics: pd.DataFrame,
     month_metrics: pd.DataFrame,
     summary: Dict,
-    output_path: str = 'Metricas_Performance_Equipo.xlsx'
+    output_path: str = 'Metricas_Performance_Equipo.xlsx',
+    output_format: str = 'xlsx'
 ) -> str:
     """
     Genera un reporte Excel completo.
@@ -386,11 +387,60 @@ def generate_excel_report(
         month_metrics: DataFrame con métricas por mes.
         summary: Diccionario con resumen ejecutivo.
         output_path: Ruta donde guardar el archivo.
+        output_format: 'xlsx' para el reporte con formato, o 'pickle' para
+            guardar los resultados sin formato (mucho más rápido) cuando se
+            consumen desde otro programa. Con 'pickle' la extensión del
+            archivo se cambia a .pkl.
 
     Returns:
         Ruta del archivo generado.
+
+    Raises:
+        ValueError: Si el formato no es soportado.
     """
+    if output_format == 'pickle':
+        return save_metrics_pickle(sprint_metrics, month_metrics, summary, output_path)
+
+    if output_format != 'xlsx':
+        raise ValueError(f"Formato de salida no soportado: {output_format}")
+
     generator = ExcelReportGenerator(sprint_metrics, month_metrics, summary, output_path)
     generator.generate()
 
     return output_path
+
+
+def save_metrics_pickle(
+    sprint_metrics: pd.DataFrame,
+    month_metrics: pd.DataFrame,
+    summary: Dict,
+    output_path: str
+) -> str:
+    """
+    Guarda las métricas sin formato en un archivo pickle.
+
+    El archivo contiene un diccionario con las claves 'sprint_metrics',
+    'month_metrics' y 'summary', y se lee con pd.read_pickle().
+
+    Args:
+        sprint_metrics: DataFrame con métricas por sprint.
+        month_metrics: DataFrame con métricas por mes.
+        summary: Diccionario con resumen ejecutivo.
+        output_path: Ruta base del archivo (se usa extensión .pkl).
+
+    Returns:
+        Ruta del archivo generado.
+    """
+    pickle_path = str(Path(output_path).with_suffix('.pkl'))
+    logger.info(f"Guardando métricas: {pickle_path}")
+
+    pd.to_pickle(
+        {
+            'sprint_metrics': sprint_metrics,
+            'month_metrics': month_metrics,
+            'summary': summary,
+        },
+        pickle_path
+    )
+
+    return pickle_path
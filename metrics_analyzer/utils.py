@@ -6,14 +6,17 @@ de datos comunes utilizados en todo el proyecto.
 """
 
 import logging
+import re
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union, Set
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Union, Set
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 from config import (
     COPY_SUFFIXES,
-    HOLIDAYS,
+    HOLIDAYS_NP,
     TASK_TYPE_ALIASES,
     TASK_TYPES_TO_TRACK,
     TASK_TYPE_DISPLAY_ORDER,
@@ -24,6 +27,10 @@ from config import (
     SPRINT_END_DAY_OF_WEEK
 )
 
+# Patrones de nombres de sprint (compilados una sola vez)
+_SPRINT_NUMBER_RE = re.compile(r'Sprint\s*(\d+)', re.IGNORECASE)
+_SPRINT_DATE_RANGE_RE = re.compile(r'\[.*?-\s*(\d{1,2}/\w+)\]')
+
 
 # Configurar logging
 def setup_logging(verbose: bool = False) -> None:
@@ -152,6 +159,83 @@ def safe_date_conversion(value: Any) -> Optional[datetime]:
     return None
 
 
+def apply_unique(series: pd.Series, func: Callable[[Any], Any]) -> pd.Series:
+    """
+    Aplica una función de conversión una sola vez por valor distinto.
+
+    Equivale a series.apply(func) (incluido el tipo de datos resultante),
+    pero la función se evalúa solo sobre los valores únicos, lo que es mucho
+    más rápido en columnas con valores repetidos como puntos o fechas.
+
+    Args:
+        series: Serie a convertir.
+        func: Función escalar (ej: safe_float_conversion, safe_date_conversion).
+
+    Returns:
+        Serie con los valores convertidos y el mismo índice.
+    """
+    codes, uniques = pd.factorize(series)
+
+    # La última posición corresponde al código -1 de los valores nulos
+    converted = np.empty(len(uniques) + 1, dtype=object)
+    for idx, value in enumerate(uniques):
+        converted[idx] = func(value)
+    converted[-1] = func(np.nan)
+
+    return pd.Series(converted[codes], index=series.index).infer_objects()
+
+
+def strip_text_column(series: pd.Series) -> pd.Series:
+    """
+    Convierte una columna a texto sin espacios al inicio ni al final.
+
+    A diferencia de series.astype(str).str.strip(), los valores nulos se
+    mantienen como nulos (en lugar del texto 'nan' o 'None') y cada valor
+    distinto se convierte una sola vez.
+
+    Args:
+        series: Serie a limpiar.
+
+    Returns:
+        Serie de texto (mismo tipo que astype(str)) con el mismo índice.
+    """
+    codes, uniques = pd.factorize(series)
+
+    # La última posición corresponde al código -1 de los valores nulos
+    stripped = np.empty(len(uniques) + 1, dtype=object)
+    for idx, value in enumerate(uniques):
+        stripped[idx] = str(value).strip()
+    stripped[-1] = np.nan
+
+    return pd.Series(stripped[codes], index=series.index, dtype=str)
+
+
+def to_datetime64_days(values: Any) -> np.ndarray:
+    """
+    Convierte un arreglo de valores a fechas datetime64[D].
+
+    Cada valor distinto se convierte una sola vez con safe_date_conversion,
+    por lo que el resultado es idéntico al de aplicarla fila a fila (la hora
+    se descarta). Valores nulos o no convertibles quedan como NaT.
+
+    Args:
+        values: Serie o arreglo con fechas en cualquier formato soportado.
+
+    Returns:
+        Array datetime64[D] del mismo largo que values.
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+
+    # La última posición (NaT) corresponde al código -1 de los valores nulos
+    days = np.full(len(uniques) + 1, np.datetime64('NaT'), dtype='datetime64[D]')
+    for idx, value in enumerate(uniques):
+        converted = safe_date_conversion(value)
+        if converted is not None:
+            days[idx] = np.datetime64(converted.date(), 'D')
+
+    return days[codes]
+
+
 def calculate_days_between(start_date: Any, end_date: Any) -> Optional[float]:
     """
     Calcula los días entre dos fechas.
@@ -180,7 +264,8 @@ def calculate_business_days(start_date: Any, end_date: Any, holidays: List[str]
     Args:
         start_date: Fecha de inicio.
         end_date: Fecha de fin.
-        holidays: Lista de fechas de feriados en formato 'YYYY-MM-DD'. Si es None, usa HOLIDAYS de config.
+        holidays: Lista de fechas de feriados en formato 'YYYY-MM-DD'. Si es None, usa HOLIDAYS_NP de config
+            (los feriados de HOLIDAYS ya convertidos a datetime64).
 
     Returns:
         Número de días hábiles entre las fechas, o None si no es posible calcular.
@@ -191,34 +276,38 @@ def calculate_business_days(start_date: Any, end_date: Any, holidays: List[str]
     if start is None or end is None:
         return None
 
-    # Usar feriados de config si no se proporcionan
+    # Usar feriados de config (ya convertidos) si no se proporcionan
     if holidays is None:
-        holidays = HOLIDAYS
+        holiday_dates = HOLIDAYS_NP
+    else:
+        holiday_dates = _parse_holidays(holidays)
+
+    # Contar días hábiles en el rango [start, end] (ambos inclusive)
+    start_day = np.datetime64(start.date(), 'D')
+    end_day = np.datetime64(end.date(), 'D')
+    business_days = np.busday_count(start_day, end_day + np.timedelta64(1, 'D'), holidays=holiday_dates)
+
+    return max(int(business_days), 0)
 
-    # Convertir feriados a set de fechas para búsqueda rápida
-    holiday_dates = set()
+
+def _parse_holidays(holidays: List[str]) -> np.ndarray:
+    """
+    Convierte una lista de feriados 'YYYY-MM-DD' a fechas NumPy.
+
+    Args:
+        holidays: Lista de fechas de feriados.
+
+    Returns:
+        Array datetime64[D] con los feriados válidos (los inválidos se omiten).
+    """
+    holiday_dates = []
     for holiday_str in holidays:
         try:
-            holiday_date = datetime.strptime(holiday_str, '%Y-%m-%d').date()
-            holiday_dates.add(holiday_date)
+            holiday_dates.append(datetime.strptime(holiday_str, '%Y-%m-%d').date())
         except ValueError:
             logging.warning(f"Fecha de feriado inválida: {holiday_str}")
 
-    # Contar días hábiles
-    business_days = 0
-    current_date = start.date() if isinstance(start, datetime) else start
-    end_date_obj = end.date() if isinstance(end, datetime) else end
-
-    while current_date <= end_date_obj:
-        # Verificar si es día de semana (lunes=0, domingo=6)
-        if current_date.weekday() < 5:  # 0-4 son días laborables
-            # Verificar si no es feriado
-            if current_date not in holiday_dates:
-                business_days += 1
-
-        current_date += timedelta(days=1)
-
-    return business_days
+    return np.array(holiday_dates, dtype='datetime64[D]')
 
 
 def format_percentage(value: Optional[float], decimals: int = 1) -> str:
@@ -307,6 +396,38 @@ def get_completion_stats(df: pd.DataFrame, column: str) -> Dict[str, Any]:
     }
 
 
+def get_columns_completion_stats(df: pd.DataFrame, columns: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Calcula estadísticas de completitud para varias columnas a la vez.
+
+    Equivale a llamar get_completion_stats por cada columna, pero los valores
+    no nulos se cuentan en una sola pasada sobre todas las columnas.
+
+    Args:
+        df: DataFrame a analizar.
+        columns: Nombres de las columnas (las que no existen se omiten).
+
+    Returns:
+        Diccionario columna -> estadísticas de completitud (mismo formato
+        que get_completion_stats), en el orden de columns.
+    """
+    present = [col for col in columns if col in df.columns]
+    total = len(df)
+    complete_counts = df[present].notna().sum()
+
+    stats = {}
+    for col in present:
+        complete = int(complete_counts[col])
+        stats[col] = {
+            'total': total,
+            'complete': complete,
+            'missing': total - complete,
+            'percentage': (complete / total) * 100 if total > 0 else 0.0
+        }
+
+    return stats
+
+
 def print_section_header(title: str, char: str = '=') -> None:
     """
     Imprime un encabezado de sección formateado.
@@ -341,6 +462,11 @@ def print_info(message: str) -> None:
     print(f"• {message}")
 
 
+def print_info_lines(messages: List[str]) -> None:
+    """Imprime varios mensajes informativos en una sola escritura."""
+    print("\n".join(f"• {message}" for message in messages))
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     Formatea un tamaño de archivo en bytes a una representación legible.
@@ -396,8 +522,6 @@ def extract_sprint_number(sprint_name: str) -> str:
     Returns:
         Nombre unificado del sprint (ej: 'Sprint 7').
     """
-    import re
-
     if pd.isna(sprint_name):
         return None
 
@@ -405,7 +529,7 @@ def extract_sprint_number(sprint_name: str) -> str:
 
     # Buscar patrón: "Sprint" seguido de números (con o sin ceros a la izquierda)
     # y opcionalmente seguido de más texto
-    match = re.search(r'Sprint\s*(\d+)', sprint_str, re.IGNORECASE)
+    match = _SPRINT_NUMBER_RE.search(sprint_str)
 
     if match:
         sprint_number = int(match.group(1))  # Convertir a int para quitar ceros a la izquierda
@@ -517,15 +641,13 @@ def extract_sprint_number_value(sprint_name: str) -> Optional[int]:
     Returns:
         Número del sprint como entero, o None si no se puede extraer.
     """
-    import re
-
     if pd.isna(sprint_name):
         return None
 
     sprint_str = str(sprint_name).strip()
 
     # Buscar patrón: "Sprint" seguido de números
-    match = re.search(r'Sprint\s*(\d+)', sprint_str, re.IGNORECASE)
+    match = _SPRINT_NUMBER_RE.search(sprint_str)
 
     if match:
         return int(match.group(1))
@@ -549,7 +671,6 @@ def calculate_sprint_end_date(sprint_name: str) -> Optional[datetime]:
     Returns:
         Fecha de finalización del sprint, o None si no se puede calcular.
     """
-    import re
     from dateutil import parser
 
     if pd.isna(sprint_name):
@@ -559,7 +680,7 @@ def calculate_sprint_end_date(sprint_name: str) -> Optional[datetime]:
 
     # Intentar extraer fecha del nombre del sprint (formato: [DD/MMM - DD/MMM])
     # Ejemplo: "Sprint 1 [08/Sep - 19/Sep]" -> 19/Sep
-    date_range_match = re.search(r'\[.*?-\s*(\d{1,2}/\w+)\]', sprint_str)
+    date_range_match = _SPRINT_DATE_RANGE_RE.search(sprint_str)
     if date_range_match:
         end_date_str = date_range_match.group(1)
         try:
@@ -587,3 +708,76 @@ def calculate_sprint_end_date(sprint_name: str) -> Optional[datetime]:
     sprint_end_date = reference_date + timedelta(days=days_diff)
 
     return sprint_end_date
+
+
+def dedup_column_names(names: List[Any]) -> List[Any]:
+    """
+    Agrega sufijos a los nombres de columna duplicados.
+
+    La primera aparición conserva su nombre y las siguientes reciben
+    "_1", "_2", etc. Los nombres vacíos (NaN) se mantienen sin cambios.
+
+    Args:
+        names: Lista de nombres de columna.
+
+    Returns:
+        Lista de nombres sin duplicados.
+
+    Examples:
+        >>> dedup_column_names(['Fecha', 'Sprint', 'Fecha'])
+        ['Fecha', 'Sprint', 'Fecha_1']
+    """
+    series = pd.Series(names, dtype=object)
+    counts = series.groupby(series, sort=False).cumcount()
+
+    return [
+        f"{name}_{int(count)}" if count > 0 else name
+        for name, count in zip(names, counts)
+    ]
+
+
+def isin_categorical(series: pd.Series, values: Any) -> np.ndarray:
+    """
+    Equivalente a Series.isin para columnas categóricas, operando sobre códigos.
+
+    Los valores buscados se resuelven una sola vez contra las categorías y la
+    comparación fila a fila se hace sobre los códigos enteros, sin hashear
+    strings. Si la serie no es categórica se usa Series.isin.
+
+    Args:
+        series: Serie (idealmente de tipo 'category').
+        values: Valores a buscar.
+
+    Returns:
+        Array booleano con True donde el valor está en values.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.isin(values).to_numpy()
+
+    matching_codes = np.flatnonzero(series.cat.categories.isin(list(values)))
+    return np.isin(series.cat.codes.to_numpy(), matching_codes)
+
+
+@lru_cache(maxsize=1)
+def get_excel_engine() -> Optional[str]:
+    """
+    Determina el motor de lectura de Excel a utilizar.
+
+    Usa 'calamine' (python-calamine) cuando está instalado y la versión de
+    pandas lo soporta (>= 2.2), ya que es considerablemente más rápido que
+    openpyxl. En caso contrario retorna None para usar el motor por defecto.
+
+    Returns:
+        Nombre del motor para pd.read_excel, o None.
+    """
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return None
+
+    version = tuple(int(part) for part in pd.__version__.split('.')[:2])
+    if version < (2, 2):
+        logger.debug("python-calamine disponible pero requiere pandas >= 2.2")
+        return None
+
+    return 'calamine'
@@ -10,6 +10,7 @@ sys.path.insert(0, 'C:\\Proyectos\\agile-metrics\\metrics_analyzer')
 from data_loader import DataLoader
 from data_processor import DataProcessor
 from metrics_calculator import MetricsCalculator
+from utils import dedup_column_names
 
 # Configuración
 file_path = r'C:\Proyectos\agile-metrics\Backlog_Planning_No_paquetizado_All_Tasks_1768419897.xlsx'
@@ -41,18 +42,11 @@ print()
 # Leer archivo (manejo especial para el formato de Monday)
 df_raw = pd.read_excel(file_path, header=1)
 new_columns = df_raw.iloc[0].tolist()
-df = df_raw.iloc[1:].copy()
+# Un solo paso: quitar la fila de headers y renumerar (sin copia intermedia)
+df = df_raw.iloc[1:].reset_index(drop=True)
 
 # Manejar columnas duplicadas: agregar sufijos
-cols = pd.Series(new_columns)
-for dup in cols[cols.duplicated()].unique():
-    dup_indices = [i for i, x in enumerate(new_columns) if x == dup]
-    for i, idx in enumerate(dup_indices):
-        if i > 0:  # Mantener la primera sin sufijo
-            new_columns[idx] = f"{dup}_{i}"
-
-df.columns = new_columns
-df.reset_index(drop=True, inplace=True)
+df.columns = dedup_column_names(new_columns)
 
 # Verificar columnas
 print("Columnas después de limpiar duplicados:")
@@ -67,7 +61,7 @@ df['Sprint Completed?'] = 'v'
 date_cols = ['Fecha Término', 'Fecha Ready for Production', 'Fecha paso a Producción']
 delivery_date_column = 'Fecha Término'  # Por defecto
 for col in date_cols:
-    if col in df.columns and df[col].notna().sum() > 0:
+    if col in df.columns and df[col].notna().any():
         delivery_date_column = col
         break
 
@@ -0,0 +1,171 @@
+"""
+Script de prueba para validar el procesamiento de datos.
+
+Prueba el cálculo de Cycle Time según el estado de cada tarea (incluida la
+fecha de fin de sprint como respaldo y las fechas no válidas) y las funciones
+auxiliares de limpieza de columnas de utils.py.
+"""
+
+import sys
+sys.path.insert(0, 'metrics_analyzer')
+
+import numpy as np
+import pandas as pd
+
+from data_processor import DataProcessor
+from utils import (
+    apply_unique,
+    dedup_column_names,
+    isin_categorical,
+    safe_float_conversion,
+    strip_text_column,
+)
+
+all_passed = True
+
+
+def check(description, result, expected):
+    """Compara un resultado con el esperado e imprime el estado."""
+    global all_passed
+    # NaN no es igual a sí mismo: dos valores nulos se consideran iguales
+    both_missing = np.isscalar(result) and pd.isna(result) and pd.isna(expected)
+    passed = bool(both_missing or result == expected)
+    status = "✓" if passed else "✗"
+    print(f"{status} {description}: {result} (esperado: {expected})")
+    if not passed:
+        all_passed = False
+
+
+# ============================================================================
+# PRUEBA 1: Cycle Time según el estado de la tarea
+# ============================================================================
+print("=" * 70)
+print("PRUEBA 1: Cycle Time por estado")
+print("=" * 70)
+
+# Todas las tareas inician el lunes 18/Ago/2025. Sprint 4 termina el viernes
+# 29/Ago/2025 (Sprint 3 termina el 15/Ago y los sprints duran 2 semanas).
+# Sprint 1 [08/Sep - 19/Sep] termina el 19/Sep, pero 18 y 19 son feriados.
+# Formato: (descripción, Estado, Sprint, Ready, Término, Cert. QA, UAT, Inicio, esperado)
+cycle_time_cases = [
+    ('Estado 13 usa Fecha Ready for Production',
+     '13. Producción', 'Sprint 4', '2025-08-20', '2025-08-22', None, None, '2025-08-18', 3),
+    ('Estado 13 sin Ready usa fin de sprint antes que Término',
+     '13. Producción', 'Sprint 4', None, '2025-08-22', None, None, '2025-08-18', 10),
+    ('Estado 11 sin Ready ni sprint usa Fecha Término',
+     '11. Ready for Product Release', None, None, '2025-08-22', None, None, '2025-08-18', 5),
+    ('Estado 9 usa Fecha Certificado QA',
+     '9. Certificado QA', 'Sprint 4', '2025-08-28', '2025-08-22', '2025-08-19', None, '2025-08-18', 2),
+    ('Estado 9 sin Certificado QA usa Fecha Término',
+     '9. Certificado QA', 'Sprint 4', '2025-08-28', '2025-08-22', None, None, '2025-08-18', 5),
+    ('Estado 9 sin Certificado QA ni Término usa fin de sprint',
+     '9. Certificado QA', 'Sprint 4', '2025-08-20', None, None, None, '2025-08-18', 10),
+    ('Estado 10 usa Fecha UAT',
+     '10. UAT', 'Sprint 4', '2025-08-28', '2025-08-22', None, '2025-08-21', '2025-08-18', 4),
+    ('Estado 10 sin UAT ni Término usa fin de sprint',
+     '10. UAT', 'Sprint 4', None, None, None, None, '2025-08-18', 10),
+    ('Estado 10 solo con Ready usa Fecha Ready for Production',
+     '10. UAT', None, '2025-08-20', None, None, None, '2025-08-18', 3),
+    ('Otro estado usa Ready antes que Término',
+     '8. En QA', 'Sprint 4', '2025-08-19', '2025-08-22', None, None, '2025-08-18', 2),
+    ('Otro estado sin Ready usa Término antes que fin de sprint',
+     '8. En QA', 'Sprint 4', None, '2025-08-22', None, None, '2025-08-18', 5),
+    ('Otro estado sin fechas usa fin de sprint',
+     '8. En QA', 'Sprint 4', None, None, None, None, '2025-08-18', 10),
+    ('Fin de sprint desde el nombre (excluye feriados)',
+     '13. Producción', 'Sprint 1 [08/Sep - 19/Sep]', None, None, None, None, '2025-09-15', 3),
+    ('Fecha de fin no válida no se reemplaza por la siguiente',
+     '13. Producción', 'Sprint 4', 'no es fecha', '2025-08-22', None, None, '2025-08-18', np.nan),
+    ('Fecha de inicio no válida',
+     '13. Producción', 'Sprint 4', '2025-08-20', None, None, None, 'sin inicio', np.nan),
+    ('Sin fecha de inicio',
+     '13. Producción', 'Sprint 4', '2025-08-20', None, None, None, None, np.nan),
+    ('Sin ninguna fecha de fin',
+     '13. Producción', None, None, None, None, None, '2025-08-18', np.nan),
+]
+
+df = pd.DataFrame(
+    [case[1:-1] for case in cycle_time_cases],
+    columns=[
+        'Estado', 'Sprint', 'Fecha Ready for Production', 'Fecha Término',
+        'Fecha Certificado QA', 'Fecha UAT', 'Fecha Inicio'
+    ],
+    dtype=object
+)
+processor = DataProcessor(df)
+estado = df['Estado'].astype('category')
+
+cycle_times = processor._calculate_cycle_time(estado, np.ones(len(df), dtype=bool))
+for case, cycle_time in zip(cycle_time_cases, cycle_times):
+    check(case[0], cycle_time, case[-1])
+
+# Las tareas no entregadas no tienen Cycle Time
+not_delivered = processor._calculate_cycle_time(estado, np.zeros(len(df), dtype=bool))
+check("Tareas no entregadas sin Cycle Time", bool(np.isnan(not_delivered).all()), True)
+
+# ============================================================================
+# PRUEBA 2: Nombres de columna duplicados
+# ============================================================================
+print("\n" + "=" * 70)
+print("PRUEBA 2: dedup_column_names()")
+print("=" * 70)
+
+check(
+    "Encabezados repetidos",
+    dedup_column_names(['Fecha', 'Sprint', 'Fecha', 'Fecha']),
+    ['Fecha', 'Sprint', 'Fecha_1', 'Fecha_2']
+)
+deduped = dedup_column_names(['Fecha', np.nan, 'Fecha', np.nan])
+check("Nombres vacíos se mantienen (posiciones 1 y 3)", [pd.isna(deduped[1]), pd.isna(deduped[3])], [True, True])
+check("Duplicado junto a nombres vacíos", [deduped[0], deduped[2]], ['Fecha', 'Fecha_1'])
+check("Sin duplicados no cambia", dedup_column_names(['A', 'B']), ['A', 'B'])
+
+# ============================================================================
+# PRUEBA 3: Limpieza de columnas de texto
+# ============================================================================
+print("\n" + "=" * 70)
+print("PRUEBA 3: strip_text_column()")
+print("=" * 70)
+
+raw = pd.Series(['  HDU ', None, np.nan, 'Bug', 3], index=[10, 11, 12, 13, 14])
+stripped = strip_text_column(raw)
+check("Espacios eliminados", [stripped[10], stripped[13]], ['HDU', 'Bug'])
+check("Valores nulos siguen nulos", stripped.isna().tolist(), [False, True, True, False, False])
+check("Números convertidos a texto", stripped[14], '3')
+check("Mismo índice", stripped.index.tolist(), raw.index.tolist())
+check("Mismo tipo que astype(str)", stripped.dtype == raw.astype(str).dtype, True)
+
+# ============================================================================
+# PRUEBA 4: apply_unique() e isin_categorical()
+# ============================================================================
+print("\n" + "=" * 70)
+print("PRUEBA 4: apply_unique() e isin_categorical()")
+print("=" * 70)
+
+points = pd.Series(['3', 'x', None, '3', 5], index=[4, 3, 2, 1, 0])
+converted = apply_unique(points, safe_float_conversion)
+expected = points.apply(safe_float_conversion)
+check("apply_unique equivale a apply", converted.equals(expected), True)
+check("apply_unique mantiene el tipo de apply", converted.dtype == expected.dtype, True)
+
+states = pd.Series(['9. Certificado QA', None, '13. Producción', '8. En QA'])
+searched = ['13. Producción', '9. Certificado QA', 'No existe']
+check(
+    "isin_categorical equivale a isin",
+    isin_categorical(states.astype('category'), searched).tolist(),
+    states.isin(searched).tolist()
+)
+check(
+    "isin_categorical con serie no categórica",
+    isin_categorical(states, searched).tolist(),
+    states.isin(searched).tolist()
+)
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✓ TODAS LAS PRUEBAS PASARON CORRECTAMENTE")
+else:
+    print("✗ ALGUNAS PRUEBAS FALLARON")
+print("=" * 70)
+
+assert all_passed, "Algunas pruebas de procesamiento de datos fallaron"